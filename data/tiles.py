@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Mapping, Sequence
 
 from data.loader import load_game_data
@@ -21,7 +22,7 @@ class BiomeDefinition:
     """Complete description of a biome tileset and spawning behaviour."""
 
     name: str
-    tiles: dict[str, dict]
+    tiles: dict[str, Mapping[str, object]]
     ground_tile: str
     forest_tiles: Sequence[str]
     forest_count: tuple[int, int]
@@ -29,6 +30,10 @@ class BiomeDefinition:
     forest_density: float
     scatter_rules: Sequence[ScatterRule]
 
+    def __post_init__(self) -> None:
+        # Map generation indexes forest tiles repeatedly; keep them immutable.
+        object.__setattr__(self, "forest_tiles", tuple(self.forest_tiles))
+
 
 def _colour_tuple(value):
     if value is None:
@@ -117,8 +122,14 @@ def _load_tiles_data() -> tuple[dict[str, dict], dict[str, dict]]:
 COMMON_TILES, BIOME_CONFIGS = _load_tiles_data()
 
 
-def _build_tileset(config: Mapping[str, object]) -> tuple[dict[str, dict], str]:
-    """Construct the final tile dictionary for a biome configuration."""
+def _build_tileset(
+    config: Mapping[str, object]
+) -> tuple[dict[str, Mapping[str, object]], str]:
+    """Construct the final tile dictionary for a biome configuration.
+
+    Every tile is frozen into a read-only mapping because map cells share
+    the same tile instance instead of holding their own copy.
+    """
 
     ground_key = config["ground_tile"]  # type: ignore[index]
     unique_tiles: Mapping[str, dict] = config["unique_tiles"]  # type: ignore[index]
@@ -155,7 +166,11 @@ def _build_tileset(config: Mapping[str, object]) -> tuple[dict[str, dict], str]:
         tile.setdefault("ground_tile", ground_key)
         tiles[name] = tile
 
-    return tiles, ground_key
+    return _freeze_tiles(tiles), ground_key
+
+
+def _freeze_tiles(tiles: Mapping[str, dict]) -> dict[str, Mapping[str, object]]:
+    return {name: MappingProxyType(tile) for name, tile in tiles.items()}
 
 
 def _build_biome(name: str, config: Mapping[str, object]) -> BiomeDefinition:
@@ -184,7 +199,7 @@ def get_biome_definition(biome: str) -> BiomeDefinition:
     return _BIOME_CACHE[biome]
 
 
-def get_biome_tiles(biome: str) -> dict[str, dict]:
+def get_biome_tiles(biome: str) -> dict[str, Mapping[str, object]]:
     """Compatibility helper returning only the tile palette for a biome."""
 
     return get_biome_definition(biome).tiles
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterator
 
@@ -36,10 +37,11 @@ def load_tileset(font_file: "str | os.PathLike[str]") -> "tcod.tileset.Tileset |
     return None
 
 
-def iter_font_candidates() -> Iterator[Path]:
+def iter_font_candidates(override: str | None = None) -> Iterator[Path]:
     """Yield font paths in priority order, honouring the environment override."""
 
-    override = os.environ.get(FONT_ENV_VAR)
+    if override is None:
+        override = os.environ.get(FONT_ENV_VAR)
     if override:
         yield Path(override)
     for candidate in FONT_PRIORITY:
@@ -47,9 +49,20 @@ def iter_font_candidates() -> Iterator[Path]:
 
 
 def load_preferred_tileset() -> tuple["tcod.tileset.Tileset | None", Path | None]:
-    """Pick the first available tileset according to priority."""
+    """Pick the first available tileset according to priority.
 
-    for candidate in iter_font_candidates():
+    The result is cached per value of the environment override, so repeated
+    calls do not probe the disk or reload the font.
+    """
+
+    return _load_preferred_tileset(os.environ.get(FONT_ENV_VAR) or "")
+
+
+@lru_cache(maxsize=1)
+def _load_preferred_tileset(
+    override: str,
+) -> tuple["tcod.tileset.Tileset | None", Path | None]:
+    for candidate in iter_font_candidates(override):
         tileset = load_tileset(candidate)
         if tileset is not None:
             return tileset, candidate
@@ -1,11 +1,18 @@
 # engine/battle.py
 import math
 import random
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Optional, Tuple
 
 
-@dataclass
+BATTLE_LOG_SIZE = 6
+_BATTLE_ACTION_LINES = ("", "Действия:", "1) Атака  2) Побег  3) Откуп")
+_BATTLE_LOG_HEADER = ("", "Журнал боя:")
+_EMPTY_BATTLE_LOG = ("...",)
+
+
+@dataclass(eq=False)
 class Enemy:
     name: str
     char: str
@@ -23,9 +30,11 @@ class Enemy:
     hp: Optional[int] = None
     defeated: bool = False
     tile_key: str | None = None
+    ch: int = field(init=False, repr=False)
 
     def __post_init__(self):
         self.hp = self.max_hp
+        self.ch = ord(self.char)
 
     @property
     def strength(self) -> int:
@@ -56,14 +65,15 @@ class Battle:
         self.player = player
         self.enemy = enemy
         self.previous_state = previous_state
-        self.log: List[str] = [f"Вы вступили в бой с {enemy.name}!"]
+        self.log: Deque[str] = deque(
+            [f"Вы вступили в бой с {enemy.name}!"], maxlen=BATTLE_LOG_SIZE
+        )
         self.finished = False
         self.result: Optional[str] = None
         self._run_attempt_locked = False
 
     def _append_log(self, message: str) -> None:
         self.log.append(message)
-        self.log = self.log[-6:]
 
     def can_run(self) -> bool:
         threshold = (self.enemy.agility + self.enemy.intelligence) / 2
@@ -165,3 +175,22 @@ class Battle:
             self._append_log(
                 f"Вы получили {self.enemy.reward_talents} талант(ов)."
             )
+
+
+def build_battle_lines(battle: Battle, talents_label: str) -> tuple[str, ...]:
+    player = battle.player
+    enemy = battle.enemy
+    turn_order = "игрок" if player.average_power() >= enemy.average_power() else "враг"
+    return (
+        f"{enemy.char}  {enemy.name}",
+        f"HP врага: {enemy.hp}/{enemy.max_hp}",
+        *_BATTLE_ACTION_LINES,
+        f"Стоимость откупа: {battle.bribe_cost()} талантов",
+        "",
+        f"Ваше здоровье: {player.hp}/{player.max_hp}",
+        f"Ходит первым: {turn_order}",
+        *_BATTLE_LOG_HEADER,
+        *(battle.log or _EMPTY_BATTLE_LOG),
+        "",
+        talents_label,
+    )
@@ -21,6 +21,11 @@ class Character:
     screen_y: int
     inventory: Inventory = field(default_factory=Inventory)
     tile_key: str | None = None
+    ch: int = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Codepoint for direct writes into tcod console arrays.
+        self.ch = ord(self.char)
 
     @property
     def strength(self) -> int:
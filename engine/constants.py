@@ -25,3 +25,6 @@ BIOME_TRANSITION_SCREENS = 4
 # Параметры передвижения.
 BASE_MOVEMENT_SPEED = 3.0  # клеток в секунду
 AGILITY_SPEED_BONUS = 0.35  # дополнительная скорость за каждую единицу ловкости
+
+# Сколько последних следов игрока хранится на одном экране.
+FOOTPRINT_LIMIT = 200
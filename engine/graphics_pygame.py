@@ -5,18 +5,56 @@ from pathlib import Path
 from typing import Iterable, Sequence
 
 import pygame
+import pygame.freetype
 
+from engine.battle import build_battle_lines
 from engine.constants import SCREEN_HEIGHT, SCREEN_WIDTH, TILE_SIZE
+from engine.input import Action
 from engine.inventory import build_inventory_context
+from engine.tilemap import TILE_TABLE
 
 
 DEFAULT_TEXT_COLOR = (240, 240, 240)
+# Единственные события, которые читают игровые циклы; остальные SDL отбрасывает сам.
+HANDLED_EVENT_TYPES = (
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.VIDEORESIZE,
+    pygame.WINDOWRESIZED,
+    pygame.WINDOWEXPOSED,
+)
+# Сколько отрисованных текстовых панелей держать в памяти.
+TEXT_PANEL_CACHE_SIZE = 16
+_CLASS_MENU_KEYS = {
+    pygame.K_1: 0,
+    pygame.K_KP1: 0,
+    pygame.K_2: 1,
+    pygame.K_KP2: 1,
+}
+_KEYMAP = {
+    pygame.K_w: Action.MOVE_UP,
+    pygame.K_s: Action.MOVE_DOWN,
+    pygame.K_a: Action.MOVE_LEFT,
+    pygame.K_d: Action.MOVE_RIGHT,
+    pygame.K_1: Action.ATTACK,
+    pygame.K_KP1: Action.ATTACK,
+    pygame.K_2: Action.RUN_AWAY,
+    pygame.K_KP2: Action.RUN_AWAY,
+    pygame.K_3: Action.BRIBE,
+    pygame.K_KP3: Action.BRIBE,
+    pygame.K_i: Action.INVENTORY,
+    pygame.K_e: Action.TRANSFER,
+}
+
+
 class PygameRenderer:
     """Small helper responsible for loading tiles and drawing the UI."""
 
     def __init__(self) -> None:
         pygame.init()
-        pygame.font.init()
+        pygame.freetype.init()
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(HANDLED_EVENT_TYPES)
         self.base_tile_size = TILE_SIZE
         self.tile_size = self.base_tile_size * 2
         self.width = SCREEN_WIDTH * self.tile_size
@@ -27,16 +65,54 @@ class PygameRenderer:
         self.canvas = pygame.Surface((self.width, self.height)).convert()
         self.window_size = self.display.get_size()
         self._saved_window_size = self.window_size
+        self._present_area: pygame.Rect | None = None
+        self._present_target: pygame.Surface | None = None
+        self._canvas_presented = False
         self.fullscreen = False
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont("Consolas", 18)
-        self.small_font = pygame.font.SysFont("Consolas", 16)
+        self.font = self._load_font(18)
+        self.small_font = self._load_font(16)
         self.tiles = self._load_tiles(Path("data/tiles"))
         if not self.tiles:
             raise RuntimeError("Не удалось загрузить спрайты из data/tiles/.")
         self.default_key = next(iter(self.tiles))
         self.default_tile = self.tiles[self.default_key]
         self._flip_cache: dict[str, pygame.Surface] = {}
+        self._text_panels: dict[tuple, pygame.Surface] = {}
+        self._tile_layers: dict[
+            tuple[str | None, str | None], tuple[pygame.Surface, pygame.Surface | None]
+        ] = {}
+        self._layers_by_id: list[tuple[pygame.Surface, pygame.Surface | None]] = []
+        self._terrain_layer: pygame.Surface | None = None
+        self._terrain_camera: tuple[int, int] | None = None
+        self._tile_positions: list[tuple[int, int]] = []
+        self._tile_positions_shape: tuple[int, int] = (0, 0)
+        self._slot_templates = self._build_slot_templates(self.tile_size)
+
+    @staticmethod
+    def _load_font(size: int) -> pygame.freetype.Font:
+        font = pygame.freetype.SysFont("Consolas", size)
+        # Выравниваем метрики по высоте строки, как у pygame.font.
+        font.pad = True
+        return font
+
+    @staticmethod
+    def _build_slot_templates(slot_size: int) -> dict[str, pygame.Surface]:
+        """Заранее отрисовать фон и рамку ячеек инвентаря для каждого состояния."""
+
+        states = {
+            "active": ((60, 60, 95), (25, 25, 40)),
+            "two_handed": ((75, 55, 100), (25, 25, 40)),
+            "passive": ((45, 45, 70), (25, 25, 40)),
+            "selected": ((110, 85, 150), (215, 195, 255)),
+        }
+        templates: dict[str, pygame.Surface] = {}
+        for state, (fill_color, border_color) in states.items():
+            surface = pygame.Surface((slot_size, slot_size), pygame.SRCALPHA).convert_alpha()
+            surface.fill(fill_color)
+            pygame.draw.rect(surface, border_color, surface.get_rect(), 2)
+            templates[state] = surface
+        return templates
 
     def _load_tiles(self, directory: Path) -> dict[str, pygame.Surface]:
         tiles: dict[str, pygame.Surface] = {}
@@ -54,32 +130,60 @@ class PygameRenderer:
 
     def clear(self) -> None:
         self.canvas.fill((0, 0, 0))
+        self._canvas_presented = False
 
     def present(self) -> None:
-        if not self.display:
+        """Вывести холст в окно.
+
+        Холст, уже показанный после последнего ``clear()``, повторно не
+        выводится, пока окно не изменится или не будет перекрыто.
+        """
+
+        if not self.display or self._canvas_presented:
             return
 
         target_width, target_height = self.window_size
         if target_width <= 0 or target_height <= 0:
             return
 
+        area = self._present_area
+        if area is None:
+            area = self._fit_canvas(target_width, target_height)
+
+        if area.size != (target_width, target_height):
+            self.display.fill((0, 0, 0))
+        if self._present_target is None:
+            self.display.blit(self.canvas, area)
+        else:
+            # Масштабируем прямо в окно, без промежуточной поверхности.
+            pygame.transform.scale(self.canvas, area.size, self._present_target)
+        pygame.display.flip()
+        self._canvas_presented = True
+
+    def _fit_canvas(self, target_width: int, target_height: int) -> pygame.Rect:
+        """Рассчитать область окна, в которую вписывается холст."""
+
         base_width, base_height = self.width, self.height
         scale = min(target_width / base_width, target_height / base_height)
         scaled_width = max(1, int(base_width * scale))
         scaled_height = max(1, int(base_height * scale))
-
-        if scaled_width == base_width and scaled_height == base_height:
-            scaled_surface = self.canvas
+        area = pygame.Rect(
+            (target_width - scaled_width) // 2,
+            (target_height - scaled_height) // 2,
+            scaled_width,
+            scaled_height,
+        )
+        self._present_area = area
+        if area.size == (base_width, base_height):
+            self._present_target = None
         else:
-            scaled_surface = pygame.transform.scale(
-                self.canvas, (scaled_width, scaled_height)
-            )
+            self._present_target = self.display.subsurface(area)
+        return area
 
-        self.display.fill((0, 0, 0))
-        offset_x = (target_width - scaled_width) // 2
-        offset_y = (target_height - scaled_height) // 2
-        self.display.blit(scaled_surface, (offset_x, offset_y))
-        pygame.display.flip()
+    def _reset_present_area(self) -> None:
+        self._present_area = None
+        self._present_target = None
+        self._canvas_presented = False
 
     def set_window_size(self, size: tuple[int, int]) -> None:
         if self.fullscreen:
@@ -91,6 +195,7 @@ class PygameRenderer:
         self.canvas = pygame.Surface((self.width, self.height)).convert()
         self.window_size = self.display.get_size()
         self._saved_window_size = self.window_size
+        self._reset_present_area()
 
     def toggle_fullscreen(self) -> None:
         if self.fullscreen:
@@ -104,12 +209,51 @@ class PygameRenderer:
             self.fullscreen = True
         self.window_size = self.display.get_size()
         self.canvas = pygame.Surface((self.width, self.height)).convert()
+        self._reset_present_area()
 
     def tick(self, fps: int = 60) -> float:
         """Ограничивает FPS и возвращает длительность кадра в секундах."""
 
         return self.clock.tick(fps) / 1000.0
 
+    def poll_actions(self, wait: bool = True) -> Iterable[Action | None]:
+        """Выдать действия нажатых клавиш из очереди событий.
+
+        Изменение окна обрабатывается здесь же и выдаётся как ``None``: холст
+        пересоздан, кадр нужно нарисовать заново. Выход и Escape завершают игру.
+        Если ``wait`` истинно, кадр уже показан и событий нет, ждёт следующего
+        события, а не крутит пустые кадры. Игровой цикл передаёт ``False``,
+        пока ждёт отрисовки, например первого кадра после меню.
+        """
+
+        events = pygame.event.get()
+        if wait and not events and self._canvas_presented:
+            events = [pygame.event.wait()]
+
+        for event in events:
+            if event.type == pygame.QUIT:
+                raise SystemExit()
+            if event.type == pygame.WINDOWEXPOSED:
+                self._canvas_presented = False
+                continue
+            if event.type in {pygame.VIDEORESIZE, pygame.WINDOWRESIZED}:
+                self.set_window_size((event.w, event.h))
+                yield None
+                continue
+            if event.type != pygame.KEYDOWN:
+                continue
+
+            key = event.key
+            if key == pygame.K_F11:
+                self.toggle_fullscreen()
+                yield None
+                continue
+            if key == pygame.K_ESCAPE:
+                raise SystemExit()
+            action = _KEYMAP.get(key)
+            if action is not None:
+                yield action
+
     def _resolve_key(self, key: str | None, fallback: str | None = None) -> str:
         if key and key in self.tiles:
             return key
@@ -128,9 +272,117 @@ class PygameRenderer:
             self._flip_cache[key] = cached
         return cached
 
+    def _layers_for(
+        self, tile_name: str | None, ground_name: str | None
+    ) -> tuple[pygame.Surface, pygame.Surface | None]:
+        """Вернуть поверхности земли и объекта для тайла, кешируя разбор ключей."""
+
+        key = (tile_name, ground_name)
+        layers = self._tile_layers.get(key)
+        if layers is None:
+            ground_key = self._resolve_key(ground_name)
+            ground_surface = self.tiles.get(ground_key, self.default_tile)
+            overlay_surface = None
+            resolved_tile_key = self._resolve_key(tile_name, ground_key)
+            if tile_name and resolved_tile_key != ground_key:
+                overlay_surface = self.tiles.get(resolved_tile_key, self.default_tile)
+            layers = (ground_surface, overlay_surface)
+            self._tile_layers[key] = layers
+        return layers
+
+    def _layers_by_tile_id(
+        self,
+    ) -> list[tuple[pygame.Surface, pygame.Surface | None]]:
+        """Вернуть слои тайлов, индексированные id из ``TILE_TABLE``."""
+
+        layers_by_id = self._layers_by_id
+        tiles = TILE_TABLE.tiles
+        for tile in tiles[len(layers_by_id) :]:
+            layers_by_id.append(
+                self._layers_for(tile.get("tile_id") or tile.get("char"), tile.get("ground_tile"))
+            )
+        return layers_by_id
+
+    def _positions_for(self, width: int, height: int) -> list[tuple[int, int]]:
+        """Вернуть пиксельные координаты клеток карты, индекс ``y * width + x``."""
+
+        if self._tile_positions_shape != (width, height):
+            tile_size = self.tile_size
+            self._tile_positions = [
+                (x * tile_size, y * tile_size)
+                for y in range(height)
+                for x in range(width)
+            ]
+            self._tile_positions_shape = (width, height)
+        return self._tile_positions
+
+    def _paint_terrain(
+        self, surface: pygame.Surface, tile_ids, left: int = 0, top: int = 0
+    ) -> None:
+        """Нарисовать блок тайлов ``tile_ids`` начиная с клетки ``(left, top)``."""
+
+        layers_by_id = self._layers_by_tile_id()
+        height, width = tile_ids.shape
+        if left == 0 and top == 0:
+            positions = self._positions_for(width, height)
+        else:
+            tile_size = self.tile_size
+            positions = [
+                (x * tile_size, y * tile_size)
+                for y in range(top, top + height)
+                for x in range(left, left + width)
+            ]
+        blit_sequence: list[tuple[pygame.Surface, tuple[int, int]]] = []
+        append = blit_sequence.append
+        for pos, tile_id in zip(positions, tile_ids.ravel().tolist()):
+            ground_surface, overlay_surface = layers_by_id[tile_id]
+            append((ground_surface, pos))
+            if overlay_surface is not None:
+                append((overlay_surface, pos))
+        surface.blits(blit_sequence, doreturn=False)
+
+    def _terrain_layer_for(self, tile_ids, camera: tuple[int, int]) -> pygame.Surface:
+        """Вернуть слой местности для камеры, обновив только изменившиеся клетки."""
+
+        height, width = tile_ids.shape
+        tile_size = self.tile_size
+        layer = self._terrain_layer
+        previous = self._terrain_camera
+        self._terrain_camera = camera
+        if layer is None or layer.get_size() != (width * tile_size, height * tile_size):
+            layer = self._terrain_layer = pygame.Surface(
+                (width * tile_size, height * tile_size)
+            ).convert()
+            previous = None
+
+        if camera == previous:
+            return layer
+
+        shift_x = camera[0] - previous[0] if previous else width
+        shift_y = camera[1] - previous[1] if previous else height
+        if abs(shift_x) >= width or abs(shift_y) >= height:
+            layer.fill((0, 0, 0))
+            self._paint_terrain(layer, tile_ids)
+            return layer
+
+        # Местность статична: сдвигаем готовое изображение и дорисовываем
+        # только открывшиеся столбцы и строки.
+        layer.scroll(-shift_x * tile_size, -shift_y * tile_size)
+        if shift_x:
+            left = width - shift_x if shift_x > 0 else 0
+            columns = slice(left, left + abs(shift_x))
+            layer.fill((0, 0, 0), (left * tile_size, 0, abs(shift_x) * tile_size, layer.get_height()))
+            self._paint_terrain(layer, tile_ids[:, columns], left, 0)
+        if shift_y:
+            top = height - shift_y if shift_y > 0 else 0
+            rows = slice(top, top + abs(shift_y))
+            layer.fill((0, 0, 0), (0, top * tile_size, layer.get_width(), abs(shift_y) * tile_size))
+            self._paint_terrain(layer, tile_ids[rows, :], 0, top)
+        return layer
+
     def draw_map(
         self,
-        tiles,
+        tile_ids,
         player,
         player_position,
         *,
@@ -138,20 +390,19 @@ class PygameRenderer:
         characters=None,
         hide_enemies: bool = False,
         footprints: Iterable[tuple[int, int, dict]] | None = None,
+        camera: tuple[int, int] | None = None,
     ) -> None:
-        for y, row in enumerate(tiles):
-            for x, tile in enumerate(row):
-                tile_name = tile.get("tile_id") or tile.get("char")
-                ground_name = tile.get("ground_tile")
-                ground_key = self._resolve_key(ground_name)
-                ground_surface = self.tiles.get(ground_key, self.default_tile)
-                pos = (x * self.tile_size, y * self.tile_size)
-                self.canvas.blit(ground_surface, pos)
-
-                resolved_tile_key = self._resolve_key(tile_name, ground_key)
-                if tile_name and resolved_tile_key != ground_key:
-                    overlay_surface = self.tiles.get(resolved_tile_key, self.default_tile)
-                    self.canvas.blit(overlay_surface, pos)
+        """Нарисовать карту и объекты на холсте.
+
+        Если передана ``camera``, тайлы берутся из закешированного слоя
+        местности: при неподвижной камере он не перерисовывается, а при
+        сдвиге прокручивается и дорисовываются только открывшиеся полосы.
+        """
+
+        if camera is None:
+            self._paint_terrain(self.canvas, tile_ids)
+        else:
+            self.canvas.blit(self._terrain_layer_for(tile_ids, camera), (0, 0))
 
         if footprints:
             for fx, fy, footprint_tile in footprints:
@@ -183,14 +434,10 @@ class PygameRenderer:
         px, py = player_position
         self.canvas.blit(player_surface, (px * self.tile_size, py * self.tile_size))
 
-    def _draw_text_panel(
-        self,
-        lines: Sequence[str | tuple[str, tuple[int, int, int]]],
-        *,
-        anchor: str = "center",
-    ) -> None:
-        if not lines:
-            return
+    def _render_text_panel(
+        self, lines: tuple[str | tuple[str, tuple[int, int, int]], ...]
+    ) -> pygame.Surface:
+        """Отрисовать панель с текстом; результат кешируется по строкам."""
 
         prepared: list[tuple[str, tuple[int, int, int]]] = []
         for entry in lines:
@@ -199,8 +446,8 @@ class PygameRenderer:
             else:
                 prepared.append((entry, DEFAULT_TEXT_COLOR))
 
-        max_width = max(self.font.size(text)[0] for text, _ in prepared)
-        line_height = self.font.get_height()
+        max_width = max(self.font.get_rect(text).width for text, _ in prepared)
+        line_height = self.font.get_sized_height()
         panel_width = max_width + 32
         panel_height = len(prepared) * line_height + 32
         panel = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
@@ -208,8 +455,26 @@ class PygameRenderer:
         pygame.draw.rect(panel, (90, 90, 140), panel.get_rect(), 2)
 
         for index, (text, color) in enumerate(prepared):
-            rendered = self.font.render(text, True, color)
-            panel.blit(rendered, (16, 16 + index * line_height))
+            self.font.render_to(panel, (16, 16 + index * line_height), text, color)
+        return panel
+
+    def _draw_text_panel(
+        self,
+        lines: Sequence[str | tuple[str, tuple[int, int, int]]],
+        *,
+        anchor: str = "center",
+    ) -> None:
+        if not lines:
+            return
+
+        key = tuple(lines)
+        panel = self._text_panels.get(key)
+        if panel is None:
+            panel = self._render_text_panel(key)
+            if len(self._text_panels) >= TEXT_PANEL_CACHE_SIZE:
+                del self._text_panels[next(iter(self._text_panels))]
+            self._text_panels[key] = panel
+        panel_width, panel_height = panel.get_size()
 
         if anchor == "top-left":
             pos = (16, 16)
@@ -220,29 +485,7 @@ class PygameRenderer:
         self.canvas.blit(panel, pos)
 
     def draw_battle_ui(self, battle, talents_label: str) -> None:
-        bribe_cost = battle.bribe_cost()
-        turn_order = (
-            "игрок" if battle.player.average_power() >= battle.enemy.average_power() else "враг"
-        )
-
-        lines = [
-            f"{battle.enemy.char}  {battle.enemy.name}",
-            f"HP врага: {battle.enemy.hp}/{battle.enemy.max_hp}",
-            "",
-            "Действия:",
-            "1) Атака  2) Побег  3) Откуп",
-            f"Стоимость откупа: {bribe_cost} талантов",
-            "",
-            f"Ваше здоровье: {battle.player.hp}/{battle.player.max_hp}",
-            f"Ходит первым: {turn_order}",
-            "",
-            "Журнал боя:",
-        ]
-
-        lines.extend(battle.log[-6:] or ["..."])
-        lines.extend(["", talents_label])
-
-        self._draw_text_panel(lines, anchor="center")
+        self._draw_text_panel(build_battle_lines(battle, talents_label), anchor="center")
 
     def draw_inventory(self, player, talents_label: str) -> None:
         overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
@@ -252,7 +495,7 @@ class PygameRenderer:
         inventory = player.inventory
         slot_size = self.tile_size
         gap = 8
-        line_height = self.small_font.get_height()
+        line_height = self.small_font.get_sized_height()
 
         active_count = len(inventory.ACTIVE_SLOT_ORDER)
         passive_cols = max(1, inventory.columns)
@@ -292,54 +535,54 @@ class PygameRenderer:
         origin_x = (self.width - panel_width) // 2
         origin_y = max(16, (self.height - panel_height) // 2 - 32)
 
-        label = self.font.render("Активные слоты:", True, (190, 210, 255))
-        label_x = (panel_width - label.get_width()) // 2
-        panel.blit(label, (label_x, section_padding - line_height // 2))
+        label_text = "Активные слоты:"
+        label_x = (panel_width - self.font.get_rect(label_text).width) // 2
+        self.font.render_to(
+            panel, (label_x, section_padding - line_height // 2), label_text, (190, 210, 255)
+        )
 
+        templates = self._slot_templates
         active_start_x = (panel_width - active_width) // 2
         slots_y = section_padding + line_height + 4
-        for index, slot_name in enumerate(inventory.ACTIVE_SLOT_ORDER):
-            slot_char = str(inventory.active_slot_symbol(slot_name))
+        for index, (_, slot_char, is_two_handed) in enumerate(inventory.active_slot_view()):
             slot_x = active_start_x + index * (slot_size + gap)
-            is_selected = index == inventory.cursor_index
-            is_two_handed = inventory.is_two_handed_slot(slot_name)
-            base_color = (60, 60, 95)
-            if is_two_handed:
-                base_color = (75, 55, 100)
-            color = (110, 85, 150) if is_selected else base_color
-            rect = pygame.Rect(slot_x, slots_y, slot_size, slot_size)
-            pygame.draw.rect(panel, color, rect)
-            border_color = (215, 195, 255) if is_selected else (25, 25, 40)
-            pygame.draw.rect(panel, border_color, rect, 2)
-            glyph = self.font.render(slot_char, True, (235, 235, 240))
-            glyph_rect = glyph.get_rect(center=rect.center)
-            panel.blit(glyph, glyph_rect)
-
-        passive_label = self.font.render("Пассивные слоты:", True, (190, 210, 255))
-        passive_label_x = (panel_width - passive_label.get_width()) // 2
+            if index == inventory.cursor_index:
+                template = templates["selected"]
+            elif is_two_handed:
+                template = templates["two_handed"]
+            else:
+                template = templates["active"]
+            rect = panel.blit(template, (slot_x, slots_y))
+            glyph_rect = self.font.get_rect(slot_char)
+            glyph_rect.center = rect.center
+            self.font.render_to(panel, glyph_rect, slot_char, (235, 235, 240))
+
+        passive_label_text = "Пассивные слоты:"
+        passive_label_x = (panel_width - self.font.get_rect(passive_label_text).width) // 2
         passive_label_y = slots_y + slot_size + 16
-        panel.blit(passive_label, (passive_label_x, passive_label_y))
+        self.font.render_to(
+            panel, (passive_label_x, passive_label_y), passive_label_text, (190, 210, 255)
+        )
 
         grid_start_y = passive_label_y + line_height + 4
         passive_start_x = (panel_width - passive_width) // 2
         total_active = len(inventory.ACTIVE_SLOT_ORDER)
+        passive_view = inventory.passive_slot_view()
         for row in range(passive_rows):
             for col in range(inventory.columns):
                 slot_index = total_active + row * inventory.columns + col
                 passive_index = slot_index - total_active
-                slot_char = str(inventory.passive_slot_symbol(passive_index))
+                slot_char = passive_view[passive_index]
                 slot_x = passive_start_x + col * (slot_size + gap)
                 slot_y = grid_start_y + row * (slot_size + 6)
-                is_selected = slot_index == inventory.cursor_index
-                base_color = (45, 45, 70)
-                color = (110, 85, 150) if is_selected else base_color
-                rect = pygame.Rect(slot_x, slot_y, slot_size, slot_size)
-                pygame.draw.rect(panel, color, rect)
-                border_color = (215, 195, 255) if is_selected else (25, 25, 40)
-                pygame.draw.rect(panel, border_color, rect, 2)
-                glyph = self.font.render(slot_char, True, (225, 225, 230))
-                glyph_rect = glyph.get_rect(center=rect.center)
-                panel.blit(glyph, glyph_rect)
+                if slot_index == inventory.cursor_index:
+                    template = templates["selected"]
+                else:
+                    template = templates["passive"]
+                rect = panel.blit(template, (slot_x, slot_y))
+                glyph_rect = self.font.get_rect(slot_char)
+                glyph_rect.center = rect.center
+                self.font.render_to(panel, glyph_rect, slot_char, (225, 225, 230))
 
         self.canvas.blit(panel, (origin_x, origin_y))
 
@@ -356,8 +599,9 @@ class PygameRenderer:
         pygame.draw.rect(context, (90, 90, 140), context.get_rect(), 2)
 
         for index, (text, color) in enumerate(visible_lines):
-            rendered = self.small_font.render(text, True, color)
-            context.blit(rendered, (16, 8 + index * (line_height + 4)))
+            self.small_font.render_to(
+                context, (16, 8 + index * (line_height + 4)), text, color
+            )
 
         context_x = origin_x
         context_y = min(self.height - context_height - 16, origin_y + panel_height + 16)
@@ -372,6 +616,7 @@ class PygameRenderer:
             options.append(
                 f"[{i}] {cls['name']} (STR {cls['str']} / AGI {cls['agi']} / INT {cls['int']})"
             )
+        class_ids = list(classes)
 
         while True:
             self.clear()
@@ -391,8 +636,7 @@ class PygameRenderer:
                 if event.key == pygame.K_F11:
                     self.toggle_fullscreen()
                     continue
-                if event.key in (pygame.K_1, pygame.K_KP1):
-                    return list(classes.keys())[0]
-                if event.key in (pygame.K_2, pygame.K_KP2) and len(classes) > 1:
-                    return list(classes.keys())[1]
+                index = _CLASS_MENU_KEYS.get(event.key)
+                if index is not None and index < len(class_ids):
+                    return class_ids[index]
 
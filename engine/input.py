@@ -0,0 +1,31 @@
+"""Player commands shared by the tcod and pygame front ends."""
+from __future__ import annotations
+
+from enum import IntEnum
+
+
+class Action(IntEnum):
+    """What a key press asks the game to do, independent of the backend.
+
+    Each renderer maps its own key constants to these values, so the game
+    loop never sees backend key codes.
+    """
+
+    MOVE_UP = 0
+    MOVE_DOWN = 1
+    MOVE_LEFT = 2
+    MOVE_RIGHT = 3
+    ATTACK = 4
+    RUN_AWAY = 5
+    BRIBE = 6
+    INVENTORY = 7
+    TRANSFER = 8
+
+
+# Movement also steers the inventory cursor.
+MOVE_DIRECTIONS: dict[Action, tuple[int, int]] = {
+    Action.MOVE_UP: (0, -1),
+    Action.MOVE_DOWN: (0, 1),
+    Action.MOVE_LEFT: (-1, 0),
+    Action.MOVE_RIGHT: (1, 0),
+}
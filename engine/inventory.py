@@ -23,60 +23,141 @@ _ACTIVE_SLOT_LABELS: dict[str, str] = {
 }
 
 _WEAPON_SLOTS: Sequence[str] = ("weapon_main", "weapon_off")
+_WEAPON_SLOTS_SET: frozenset[str] = frozenset(_WEAPON_SLOTS)
+
+# Active slots are stored in a list aligned with ``_ACTIVE_SLOT_ORDER``.
+_ACTIVE_SLOT_INDEX: dict[str, int] = {
+    slot_name: index for index, slot_name in enumerate(_ACTIVE_SLOT_ORDER)
+}
+UPPER = _ACTIVE_SLOT_INDEX["upper"]
+BOOTS = _ACTIVE_SLOT_INDEX["boots"]
+WEAPON_MAIN = _ACTIVE_SLOT_INDEX["weapon_main"]
+WEAPON_OFF = _ACTIVE_SLOT_INDEX["weapon_off"]
+_WEAPON_SLOT_INDICES: tuple[int, ...] = (WEAPON_MAIN, WEAPON_OFF)
+_WEAPON_INDEX_SET: frozenset[int] = frozenset(_WEAPON_SLOT_INDICES)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class InventoryItem:
-    """Represents an item that can live in the player's inventory."""
+    """Represents an item that can live in the player's inventory.
+
+    Items compare by identity: two equal-looking daggers are still two items.
+    """
 
     name: str
     icon: str
     slot_type: str
     two_handed: bool = False
     damage_bonus: int = 0
+    _symbol: str = field(default="*", init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.icon:
+            self._symbol = self.icon
+        elif self.name:
+            self._symbol = self.name[0].upper()
+        else:
+            self._symbol = "*"
 
     def symbol(self) -> str:
         """Return the preferred character for UI rendering."""
 
-        if self.icon:
-            return self.icon
-        if self.name:
-            return self.name[0].upper()
-        return "*"
+        return self._symbol
 
 
-@dataclass
+@dataclass(slots=True, init=False)
 class Inventory:
-    """Manages active equipment slots and passive backpack storage."""
+    """Manages active equipment slots and passive backpack storage.
+
+    ``__init__`` is written out so ``passive_slots`` and ``cursor_index`` stay
+    constructor arguments while the attributes are read-only or guarded
+    properties over private fields.
+    """
 
     ACTIVE_SLOT_ORDER: ClassVar[Sequence[str]] = _ACTIVE_SLOT_ORDER
     ACTIVE_SLOT_LABELS: ClassVar[dict[str, str]] = _ACTIVE_SLOT_LABELS
     WEAPON_SLOTS: ClassVar[Sequence[str]] = _WEAPON_SLOTS
 
-    passive_columns: int = 4
-    passive_rows: int = 3
-    passive_slots: List[InventoryItem | None] = field(default_factory=list)
-    active_slots: dict[str, InventoryItem | None] = field(
-        default_factory=lambda: {
-            "upper": None,
-            "boots": None,
-            "weapon_main": None,
-            "weapon_off": None,
-        }
+    passive_columns: int
+    passive_rows: int
+    # Written only through ``_set_passive`` so the occupancy mask, free count
+    # and cached backpack view stay in step; read it via ``passive_slots``.
+    _passive_slots: List[InventoryItem | None]
+    active_slots: List[InventoryItem | None]
+    # Written only through ``_set_cursor`` so ``_cursor_position`` stays in step.
+    _cursor_index: int
+    last_message: str
+    _active_view: tuple[tuple[str, str, bool], ...] | None = field(repr=False, compare=False)
+    _passive_view: tuple[str, ...] | None = field(repr=False, compare=False)
+    _passive_items: tuple[InventoryItem | None, ...] | None = field(
+        repr=False, compare=False
     )
-    cursor_index: int = 0
-    last_message: str = ""
+    _cursor_position: tuple[int, int] = field(repr=False, compare=False)
+    # Layout bounds used to clamp cursor moves.
+    _last_col: int = field(repr=False, compare=False)
+    _last_row: int = field(repr=False, compare=False)
+    _last_index: int = field(repr=False, compare=False)
+    # Per-slot label and section name, indexed like ``cursor_index``.
+    _labels: tuple[str, ...] = field(repr=False, compare=False)
+    _sections: tuple[str, ...] = field(repr=False, compare=False)
+    # Bumped on every cursor move or slot change; keys the render context cache.
+    _version: int = field(repr=False, compare=False)
+    _context_cache: tuple[tuple, list[tuple[str, tuple[int, int, int]]]] | None = field(
+        repr=False, compare=False
+    )
+    # Bit ``i`` is set while passive slot ``i`` holds an item.
+    _occupied_mask: int = field(repr=False, compare=False)
+    _free_count: int = field(repr=False, compare=False)
+
+    def __init__(
+        self,
+        passive_columns: int = 4,
+        passive_rows: int = 3,
+        passive_slots: List[InventoryItem | None] | None = None,
+        active_slots: List[InventoryItem | None] | None = None,
+        cursor_index: int = 0,
+        last_message: str = "",
+    ) -> None:
+        self.passive_columns = passive_columns
+        self.passive_rows = passive_rows
+        self._passive_slots = passive_slots
+        self.active_slots = active_slots
+        self.last_message = last_message
+        self._active_view = None
+        self._passive_view = None
+        self._passive_items = None
+        self._version = 0
+        self._context_cache = None
 
-    def __post_init__(self) -> None:
         total_passive = self.passive_columns * self.passive_rows
-        if not self.passive_slots:
-            self.passive_slots = [None] * total_passive
-        elif len(self.passive_slots) != total_passive:
-            slots = list(self.passive_slots)[:total_passive]
+        if not self._passive_slots:
+            self._passive_slots = [None] * total_passive
+        else:
+            # Copy so the caller's list cannot bypass ``_set_passive``.
+            slots = list(self._passive_slots)[:total_passive]
             slots.extend([None] * (total_passive - len(slots)))
-            self.passive_slots = slots
-
-        self.cursor_index = max(0, min(self.cursor_index, self.total_slots - 1))
+            self._passive_slots = slots
+        if self.active_slots is None:
+            self.active_slots = [None] * len(self.ACTIVE_SLOT_ORDER)
+
+        self._occupied_mask = 0
+        self._free_count = len(self._passive_slots)
+        for index, item in enumerate(self._passive_slots):
+            if item is not None:
+                self._occupied_mask |= 1 << index
+                self._free_count -= 1
+
+        self._last_col = self.columns - 1
+        self._last_row = self.rows - 1
+        self._last_index = self.total_slots - 1
+        self._labels = tuple(
+            self.ACTIVE_SLOT_LABELS.get(slot_name, slot_name)
+            for slot_name in self.ACTIVE_SLOT_ORDER
+        ) + tuple(f"Рюкзак {index + 1}" for index in range(total_passive))
+        self._sections = ("active",) * len(self.ACTIVE_SLOT_ORDER) + (
+            "passive",
+        ) * total_passive
+        self._set_cursor(max(0, min(cursor_index, self._last_index)))
 
     @property
     def columns(self) -> int:
@@ -90,32 +171,45 @@ class Inventory:
     def total_slots(self) -> int:
         return len(self.ACTIVE_SLOT_ORDER) + self.passive_columns * self.passive_rows
 
+    @property
+    def passive_slots(self) -> tuple[InventoryItem | None, ...]:
+        """Backpack contents in grid order; change them via ``set_passive_slot``.
+
+        The tuple is rebuilt only after a cell changes.
+        """
+
+        if self._passive_items is None:
+            self._passive_items = tuple(self._passive_slots)
+        return self._passive_items
+
+    @property
+    def cursor_index(self) -> int:
+        return self._cursor_index
+
+    @cursor_index.setter
+    def cursor_index(self, index: int) -> None:
+        self._set_cursor(max(0, min(index, self._last_index)))
+
     @property
     def cursor_position(self) -> tuple[int, int]:
-        row, col = divmod(self.cursor_index, self.columns)
-        return col, row
+        return self._cursor_position
 
     def is_active_index(self, index: int) -> bool:
         return 0 <= index < len(self.ACTIVE_SLOT_ORDER)
 
     def selected_section(self) -> str:
-        return "active" if self.is_active_index(self.cursor_index) else "passive"
+        return self._sections[self.cursor_index]
 
     def slot_at(self, index: int) -> InventoryItem | None:
         if self.is_active_index(index):
-            slot_name = self.ACTIVE_SLOT_ORDER[index]
-            return self.active_slots.get(slot_name)
+            return self.active_slots[index]
         passive_index = index - len(self.ACTIVE_SLOT_ORDER)
-        if 0 <= passive_index < len(self.passive_slots):
-            return self.passive_slots[passive_index]
+        if 0 <= passive_index < len(self._passive_slots):
+            return self._passive_slots[passive_index]
         return None
 
     def slot_label(self, index: int) -> str:
-        if self.is_active_index(index):
-            slot_name = self.ACTIVE_SLOT_ORDER[index]
-            return self.ACTIVE_SLOT_LABELS.get(slot_name, slot_name)
-        passive_index = index - len(self.ACTIVE_SLOT_ORDER)
-        return f"Рюкзак {passive_index + 1}"
+        return self._labels[index]
 
     def selected_item(self) -> InventoryItem | None:
         return self.slot_at(self.cursor_index)
@@ -127,6 +221,8 @@ class Inventory:
     def display_symbol(item) -> str:
         if item is None:
             return "·"
+        if type(item) is InventoryItem:
+            return item._symbol
         symbol = getattr(item, "symbol", None)
         if callable(symbol):
             return symbol()
@@ -135,43 +231,107 @@ class Inventory:
         return str(item)[0]
 
     def active_slot_symbol(self, slot_name: str) -> str:
-        return self.display_symbol(self.active_slots.get(slot_name))
+        return self.display_symbol(self.active_slots[_ACTIVE_SLOT_INDEX[slot_name]])
 
     def passive_slot_symbol(self, index: int) -> str:
-        return self.display_symbol(self.passive_slots[index])
+        return self.display_symbol(self._passive_slots[index])
 
     def is_two_handed_slot(self, slot_name: str) -> bool:
-        item = self.active_slots.get(slot_name)
-        if not item or not getattr(item, "two_handed", False):
-            return False
-        other = "weapon_off" if slot_name == "weapon_main" else "weapon_main"
-        return self.active_slots.get(other) is item
+        return self._is_two_handed_at(_ACTIVE_SLOT_INDEX[slot_name])
+
+    def active_slot_view(self) -> tuple[tuple[str, str, bool], ...]:
+        """Return ``(slot_name, symbol, two_handed)`` for every active slot.
+
+        The tuple is rebuilt only after the slots change, so renderers can
+        iterate it every frame without re-resolving symbols.
+        """
+
+        if self._active_view is None:
+            self._active_view = tuple(
+                (slot_name, self.display_symbol(item), self._is_two_handed_at(index))
+                for index, (slot_name, item) in enumerate(self.iter_active_slots())
+            )
+        return self._active_view
+
+    def passive_slot_view(self) -> tuple[str, ...]:
+        """Return the display symbol of every passive slot in grid order."""
 
+        if self._passive_view is None:
+            self._passive_view = tuple(self.display_symbol(item) for item in self._passive_slots)
+        return self._passive_view
+
+    def set_passive_slot(self, index: int, item: InventoryItem | None) -> None:
+        """Place ``item`` into the given backpack cell."""
+
+        self._set_passive(index, item)
+        self._invalidate_views()
 
     def move_cursor(self, dx: int, dy: int) -> None:
         """Move the selection cursor across active and passive slots."""
 
         if dx == 0 and dy == 0:
             return
-        x, y = self.cursor_position
-        new_x = max(0, min(self.columns - 1, x + dx))
-        new_y = max(0, min(self.rows - 1, y + dy))
-        self.cursor_index = min(self.total_slots - 1, new_y * self.columns + new_x)
+        x, y = self._cursor_position
+        new_x = x + dx
+        new_x = 0 if new_x < 0 else self._last_col if new_x > self._last_col else new_x
+        new_y = y + dy
+        new_y = 0 if new_y < 0 else self._last_row if new_y > self._last_row else new_y
+        index = new_y * self.passive_columns + new_x
+        self._set_cursor(self._last_index if index > self._last_index else index)
         self.clear_message()
 
     def transfer_selected(self) -> bool:
         """Move the selected item between active and passive sections."""
 
         if self.selected_section() == "active":
-            return self._transfer_active_to_passive()
-        return self._transfer_passive_to_active()
+            moved = self._transfer_active_to_passive()
+        else:
+            moved = self._transfer_passive_to_active()
+        if moved:
+            self._invalidate_views()
+        return moved
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
+    def _set_cursor(self, index: int) -> None:
+        """Move the cursor and refresh its cached ``(column, row)`` pair."""
+
+        self._cursor_index = index
+        row, col = divmod(index, self.columns)
+        self._cursor_position = (col, row)
+        self._version += 1
+
+    def _invalidate_views(self) -> None:
+        self._active_view = None
+        self._passive_view = None
+        self._version += 1
+
+    def _set_passive(self, index: int, item: InventoryItem | None) -> None:
+        """Write a backpack cell and keep the occupancy mask in sync."""
+
+        bit = 1 << index
+        if item is None:
+            if self._occupied_mask & bit:
+                self._occupied_mask &= ~bit
+                self._free_count += 1
+        elif not self._occupied_mask & bit:
+            self._occupied_mask |= bit
+            self._free_count -= 1
+        self._passive_slots[index] = item
+        self._passive_items = None
+
+    def _is_two_handed_at(self, index: int) -> bool:
+        item = self.active_slots[index]
+        if not item or not getattr(item, "two_handed", False):
+            return False
+        other = WEAPON_OFF if index == WEAPON_MAIN else WEAPON_MAIN
+        return self.active_slots[other] is item
+
     def _transfer_active_to_passive(self) -> bool:
-        slot_name = self.ACTIVE_SLOT_ORDER[self.cursor_index]
-        item = self.active_slots.get(slot_name)
+        active = self.active_slots
+        index = self.cursor_index
+        item = active[index]
         if item is None:
             self.last_message = "Слот пуст."
             return False
@@ -179,10 +339,10 @@ class Inventory:
             self.last_message = "Нет свободного места в рюкзаке."
             return False
 
-        if slot_name in self.WEAPON_SLOTS and item.two_handed:
+        if index in _WEAPON_INDEX_SET and item.two_handed:
             self._clear_weapon_item(item)
         else:
-            self.active_slots[slot_name] = None
+            active[index] = None
 
         self._store_in_passive(item)
         self.last_message = f"{item.name} перемещён в рюкзак."
@@ -190,31 +350,31 @@ class Inventory:
 
     def _transfer_passive_to_active(self) -> bool:
         passive_index = self.cursor_index - len(self.ACTIVE_SLOT_ORDER)
-        item = self.passive_slots[passive_index]
+        item = self._passive_slots[passive_index]
         if item is None:
             self.last_message = "Пустая ячейка."
             return False
 
         if item.slot_type == "upper":
-            success = self._equip_to_single_slot("upper", item)
+            success = self._equip_to_single_slot(UPPER, item)
         elif item.slot_type == "boots":
-            success = self._equip_to_single_slot("boots", item)
-        elif item.slot_type == "weapon" or item.slot_type in self.WEAPON_SLOTS:
+            success = self._equip_to_single_slot(BOOTS, item)
+        elif item.slot_type == "weapon" or item.slot_type in _WEAPON_SLOTS_SET:
             success = self._equip_weapon(item)
         else:
             self.last_message = "Этот предмет нельзя активировать."
             return False
 
         if success:
-            self.passive_slots[passive_index] = None
+            self._set_passive(passive_index, None)
             target_section = "активные слоты"
-            if item.slot_type == "weapon" or item.slot_type in self.WEAPON_SLOTS:
+            if item.slot_type == "weapon" or item.slot_type in _WEAPON_SLOTS_SET:
                 target_section = "оружие"
             self.last_message = f"{item.name} перемещён в {target_section}."
         return success
 
-    def _equip_to_single_slot(self, slot_name: str, item: InventoryItem) -> bool:
-        current = self.active_slots.get(slot_name)
+    def _equip_to_single_slot(self, index: int, item: InventoryItem) -> bool:
+        current = self.active_slots[index]
         if current is item:
             self.last_message = "Предмет уже надет."
             return False
@@ -222,13 +382,14 @@ class Inventory:
             if not self._has_free_passive_slot():
                 self.last_message = "Нет места, чтобы снять текущий предмет."
                 return False
-            self.active_slots[slot_name] = None
+            self.active_slots[index] = None
             self._store_in_passive(current)
 
-        self.active_slots[slot_name] = item
+        self.active_slots[index] = item
         return True
 
     def _equip_weapon(self, item: InventoryItem) -> bool:
+        active = self.active_slots
         equipped_items = self._collect_weapon_items(exclude=item)
         free_slots = self._free_passive_slots()
 
@@ -239,8 +400,8 @@ class Inventory:
             for existing in equipped_items:
                 self._clear_weapon_item(existing)
                 self._store_in_passive(existing)
-            self.active_slots["weapon_main"] = item
-            self.active_slots["weapon_off"] = item
+            active[WEAPON_MAIN] = item
+            active[WEAPON_OFF] = item
             return True
 
         # handle currently equipped two-handed weapons
@@ -253,13 +414,13 @@ class Inventory:
                 self._store_in_passive(existing)
             equipped_items = []
 
-        if any(self.active_slots[slot] is item for slot in self.WEAPON_SLOTS):
+        if any(active[index] is item for index in _WEAPON_SLOT_INDICES):
             self.last_message = "Предмет уже экипирован."
             return False
 
-        for slot_name in self.WEAPON_SLOTS:
-            if self.active_slots[slot_name] is None:
-                self.active_slots[slot_name] = item
+        for index in _WEAPON_SLOT_INDICES:
+            if active[index] is None:
+                active[index] = item
                 return True
 
         if free_slots == 0:
@@ -267,37 +428,39 @@ class Inventory:
             return False
 
         # move off-hand item to backpack by default
-        off_item = self.active_slots["weapon_off"]
+        off_item = active[WEAPON_OFF]
         if off_item is not None:
-            self.active_slots["weapon_off"] = None
+            active[WEAPON_OFF] = None
             self._store_in_passive(off_item)
-            self.active_slots["weapon_off"] = item
+            active[WEAPON_OFF] = item
             return True
 
-        main_item = self.active_slots["weapon_main"]
+        main_item = active[WEAPON_MAIN]
         if main_item is not None:
-            self.active_slots["weapon_main"] = None
+            active[WEAPON_MAIN] = None
             self._store_in_passive(main_item)
-        self.active_slots["weapon_main"] = item
+        active[WEAPON_MAIN] = item
         return True
 
     def _store_in_passive(self, item: InventoryItem) -> int | None:
-        for index, slot in enumerate(self.passive_slots):
-            if slot is None:
-                self.passive_slots[index] = item
-                return index
-        return None
+        free = ~self._occupied_mask & ((1 << len(self._passive_slots)) - 1)
+        if not free:
+            return None
+        # Lowest set bit of the free mask is the first empty cell.
+        index = (free & -free).bit_length() - 1
+        self._set_passive(index, item)
+        return index
 
     def _has_free_passive_slot(self) -> bool:
-        return any(slot is None for slot in self.passive_slots)
+        return self._free_count > 0
 
     def _free_passive_slots(self) -> int:
-        return sum(1 for slot in self.passive_slots if slot is None)
+        return self._free_count
 
     def _collect_weapon_items(self, exclude: InventoryItem | None = None) -> List[InventoryItem]:
         collected: List[InventoryItem] = []
-        for slot_name in self.WEAPON_SLOTS:
-            item = self.active_slots.get(slot_name)
+        for index in _WEAPON_SLOT_INDICES:
+            item = self.active_slots[index]
             if item is None:
                 continue
             if exclude is not None and item is exclude:
@@ -307,13 +470,12 @@ class Inventory:
         return collected
 
     def _clear_weapon_item(self, item: InventoryItem) -> None:
-        for slot_name in self.WEAPON_SLOTS:
-            if self.active_slots.get(slot_name) is item:
-                self.active_slots[slot_name] = None
+        for index in _WEAPON_SLOT_INDICES:
+            if self.active_slots[index] is item:
+                self.active_slots[index] = None
 
     def iter_active_slots(self) -> Iterable[tuple[str, InventoryItem | None]]:
-        for slot_name in self.ACTIVE_SLOT_ORDER:
-            yield slot_name, self.active_slots.get(slot_name)
+        return zip(self.ACTIVE_SLOT_ORDER, self.active_slots)
 
     def passive_index_range(self) -> range:
         return range(len(self.ACTIVE_SLOT_ORDER), self.total_slots)
@@ -326,7 +488,25 @@ class Inventory:
 
 
 def build_inventory_context(player: "Player", talents_label: str) -> list[tuple[str, tuple[int, int, int]]]:
+    """Return the info panel lines, reusing the last result while nothing changed."""
+
     inventory = player.inventory
+    cache_key = (
+        inventory._version,
+        inventory.last_message,
+        talents_label,
+        player.name,
+        player.character_class,
+        player.strength,
+        player.agility,
+        player.intelligence,
+        player.hp,
+        player.max_hp,
+    )
+    cached = inventory._context_cache
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+
     lines: list[tuple[str, tuple[int, int, int]]] = []
 
     lines.append((f"Имя: {player.name}", (245, 245, 245)))
@@ -375,4 +555,5 @@ def build_inventory_context(player: "Player", talents_label: str) -> list[tuple[
 
     lines.append(("Управление: WASD — выбор, E — перенос, I — закрыть", (180, 180, 200)))
 
+    inventory._context_cache = (cache_key, lines)
     return lines
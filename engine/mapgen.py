@@ -2,58 +2,110 @@
 
 from __future__ import annotations
 
-import random
-from typing import Sequence
+import numpy as np
 
 from data.tiles import BiomeDefinition
+from engine.tilemap import TILE_ID_DTYPE, TILE_TABLE, TileGrid
 
 
-def _pick_forest_tile(options: Sequence[str]) -> str | None:
-    if not options:
-        return None
-    return random.choice(list(options))
+_RNG = np.random.default_rng()
+_DISK_MASKS: dict[int, np.ndarray] = {}
 
 
-def generate_map(width: int, height: int, biome: BiomeDefinition):
-    """Create a random map using biome-specific tiles and scatter rules."""
+def _disk_mask(radius: int) -> np.ndarray:
+    """Return a cached ``(2r+1, 2r+1)`` mask of cells closer than ``radius``."""
+
+    mask = _DISK_MASKS.get(radius)
+    if mask is None:
+        offsets_y, offsets_x = np.ogrid[-radius : radius + 1, -radius : radius + 1]
+        mask = offsets_x * offsets_x + offsets_y * offsets_y < radius * radius
+        mask.setflags(write=False)
+        _DISK_MASKS[radius] = mask
+    return mask
+
+
+def _stamp_forest(
+    tile_ids: np.ndarray,
+    fx: int,
+    fy: int,
+    radius: int,
+    density: float,
+    forest_ids: np.ndarray,
+    rng: np.random.Generator,
+) -> None:
+    """Scatter forest ids over the cached disk around ``(fx, fy)``.
+
+    The disk is clipped to the map interior so border cells stay untouched.
+    """
+
+    height, width = tile_ids.shape
+    x0, x1 = max(1, fx - radius), min(width - 1, fx + radius + 1)
+    y0, y1 = max(1, fy - radius), min(height - 1, fy + radius + 1)
+    if x0 >= x1 or y0 >= y1:
+        return
+    disk = _disk_mask(radius)[
+        y0 - fy + radius : y1 - fy + radius, x0 - fx + radius : x1 - fx + radius
+    ]
+    mask = disk & (rng.random(disk.shape) < density)
+    count = int(np.count_nonzero(mask))
+    if count:
+        picks = rng.integers(0, len(forest_ids), count)
+        tile_ids[y0:y1, x0:x1][mask] = forest_ids[picks]
+
+
+def generate_map(
+    width: int,
+    height: int,
+    biome: BiomeDefinition,
+    rng: np.random.Generator | None = None,
+) -> TileGrid:
+    """Create a random map using biome-specific tiles and scatter rules.
+
+    The map is returned as a :class:`TileGrid` of interned tile ids. Random
+    samples are drawn in batches from ``rng`` (a module-wide generator by
+    default).
+    """
+
+    if rng is None:
+        rng = _RNG
 
     tiles = biome.tiles
-    ground_key = biome.ground_tile
-    ground_tile = tiles[ground_key]
+    tile_index = {name: TILE_TABLE.intern(tile) for name, tile in tiles.items()}
 
-    game_map = [[ground_tile.copy() for _ in range(width)] for _ in range(height)]
+    tile_ids = np.full((height, width), tile_index[biome.ground_tile], dtype=TILE_ID_DTYPE)
+    interior = np.zeros((height, width), dtype=bool)
+    interior[1:-1, 1:-1] = True
 
     min_forests, max_forests = biome.forest_count
     min_radius, max_radius = biome.forest_radius
     density = biome.forest_density
+    forest_ids = np.array(
+        [tile_index[name] for name in biome.forest_tiles if name], dtype=TILE_ID_DTYPE
+    )
+
+    num_forests = int(rng.integers(min_forests, max_forests, endpoint=True))
+    centres_x = rng.integers(1, width - 2, num_forests, endpoint=True).tolist()
+    centres_y = rng.integers(1, height - 2, num_forests, endpoint=True).tolist()
+    radii = rng.integers(min_radius, max_radius, num_forests, endpoint=True).tolist()
+    if forest_ids.size:
+        for fx, fy, radius in zip(centres_x, centres_y, radii):
+            _stamp_forest(tile_ids, fx, fy, radius, density, forest_ids, rng)
 
-    num_forests = random.randint(min_forests, max_forests)
-    for _ in range(num_forests):
-        fx = random.randint(1, width - 2)
-        fy = random.randint(1, height - 2)
-        radius = random.randint(min_radius, max_radius)
-
-        for y in range(max(0, fy - radius), min(height, fy + radius + 1)):
-            for x in range(max(0, fx - radius), min(width, fx + radius + 1)):
-                if x in (0, width - 1) or y in (0, height - 1):
-                    continue
-                dist = ((x - fx) ** 2 + (y - fy) ** 2) ** 0.5
-                if dist < radius and random.random() < density:
-                    tile_name = _pick_forest_tile(biome.forest_tiles)
-                    if tile_name:
-                        game_map[y][x] = tiles[tile_name].copy()
-
-    for rule in biome.scatter_rules:
-        count = random.randint(*rule.count_range)
-        tile_name = rule.tile
-        if tile_name not in tiles:
-            continue
-        for _ in range(count):
-            x = random.randint(0, width - 1)
-            y = random.randint(0, height - 1)
-            if rule.avoid_border and (x in (0, width - 1) or y in (0, height - 1)):
-                continue
-            game_map[y][x] = tiles[tile_name].copy()
-
-    return game_map
+    # All scatter rules are placed in one batch; later rules still win ties
+    # because fancy assignment keeps the last write per cell.
+    rules = [rule for rule in biome.scatter_rules if rule.tile in tiles]
+    if rules:
+        low, high = np.array([rule.count_range for rule in rules]).T
+        counts = rng.integers(low, high, endpoint=True)
+        placed_ids = np.repeat(
+            np.array([tile_index[rule.tile] for rule in rules], dtype=TILE_ID_DTYPE),
+            counts,
+        )
+        avoid_border = np.repeat([rule.avoid_border for rule in rules], counts)
+        total = len(placed_ids)
+        px = rng.integers(0, width, total)
+        py = rng.integers(0, height, total)
+        keep = ~avoid_border | interior[py, px]
+        tile_ids[py[keep], px[keep]] = placed_ids[keep]
 
+    return TileGrid(tile_ids)
@@ -1,5 +1,7 @@
 # engine/player.py
 import random
+from collections import OrderedDict
+from typing import Collection
 
 from data.tiles import TILES
 from engine.constants import AGILITY_SPEED_BONUS, BASE_MOVEMENT_SPEED
@@ -7,6 +9,27 @@ from engine.inventory import Inventory, InventoryItem
 
 
 class Player:
+    __slots__ = (
+        "x",
+        "y",
+        "screen_x",
+        "screen_y",
+        "tile",
+        "tile_key",
+        "name",
+        "character_class",
+        "stats",
+        "max_hp",
+        "hp",
+        "talents",
+        "_footprints",
+        "inventory",
+        "facing",
+        "_movement_speed",
+        "_movement_interval",
+        "_rng",
+    )
+
     def __init__(
         self,
         x: int,
@@ -31,7 +54,12 @@ class Player:
         self.max_hp = 20 + stats.get("str", 0) * 2
         self.hp = self.max_hp
         self.talents = 100
-        self._footprints: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        self._rng = random.Random()
+        # Ловкость задаётся классом и не меняется, поэтому шаг считается один раз.
+        speed = BASE_MOVEMENT_SPEED + self.agility * AGILITY_SPEED_BONUS
+        self._movement_speed = speed
+        self._movement_interval = 1.0 / speed if speed > 0 else 0.0
+        self._footprints: dict[tuple[int, int], OrderedDict[tuple[int, int], None]] = {}
         self.inventory = Inventory()
         self._seed_starting_items()
         self.facing = 1
@@ -52,22 +80,20 @@ class Player:
         return (self.strength + self.agility + self.intelligence) / 3
 
     def attack_damage(self) -> int:
-        return random.randint(1, max(1, self.strength))
+        strength = self.strength
+        return self._rng.randrange(1, strength + 1 if strength > 0 else 2)
 
     @property
     def movement_speed(self) -> float:
         """Возвращает скорость передвижения в клетках в секунду."""
 
-        return BASE_MOVEMENT_SPEED + self.agility * AGILITY_SPEED_BONUS
+        return self._movement_speed
 
     @property
     def movement_interval(self) -> float:
         """Минимальное время между шагами в секундах."""
 
-        speed = self.movement_speed
-        if speed <= 0:
-            return 0.0
-        return 1.0 / speed
+        return self._movement_interval
 
     def position(self) -> tuple[int, int, int, int]:
         return self.screen_x, self.screen_y, self.x, self.y
@@ -92,15 +118,24 @@ class Player:
         position: tuple[int, int],
         limit: int | None = None,
     ) -> None:
-        footprints = self._footprints.setdefault(screen_coords, [])
-        if position in footprints:
-            footprints.remove(position)
-        footprints.append(position)
-        if limit is not None and len(footprints) > limit:
-            del footprints[0 : len(footprints) - limit]
-
-    def get_footprints(self, screen_coords: tuple[int, int]) -> list[tuple[int, int]]:
-        return list(self._footprints.get(screen_coords, []))
+        footprints = self._footprints.get(screen_coords)
+        if footprints is None:
+            footprints = self._footprints[screen_coords] = OrderedDict()
+        try:
+            footprints.move_to_end(position)
+        except KeyError:
+            footprints[position] = None
+        if limit is not None:
+            while len(footprints) > limit:
+                footprints.popitem(last=False)
+
+    def get_footprints(
+        self, screen_coords: tuple[int, int]
+    ) -> Collection[tuple[int, int]]:
+        """Следы на экране от старых к новым; живое представление, без копии."""
+
+        footprints = self._footprints.get(screen_coords)
+        return footprints.keys() if footprints is not None else ()
 
     def clear_footprints(self, screen_coords: tuple[int, int]) -> None:
         self._footprints.pop(screen_coords, None)
@@ -115,6 +150,7 @@ class Player:
             InventoryItem("Алебарда", "†", "weapon", two_handed=True, damage_bonus=4),
         ]
 
+        capacity = len(self.inventory.passive_slots)
         for index, item in enumerate(starters):
-            if index < len(self.inventory.passive_slots):
-                self.inventory.passive_slots[index] = item
+            if index < capacity:
+                self.inventory.set_passive_slot(index, item)
@@ -0,0 +1,77 @@
+"""Array-backed terrain storage."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Mapping
+
+import numpy as np
+
+
+TILE_ID_DTYPE = np.uint16
+# Same layout as ``tcod.console.rgb_graphic`` so rows can be copied straight
+# into ``Console.rgb``.
+TILE_GRAPHIC_DTYPE = np.dtype([("ch", np.int32), ("fg", "3B"), ("bg", "3B")])
+
+
+class TileTable:
+    """Registry giving every distinct tile mapping a small integer id.
+
+    Tiles are interned by identity: biome palettes hand out shared read-only
+    instances, so two biomes' ``"tree"`` tiles get separate ids. Per-id
+    attributes live in parallel arrays so whole grids can be looked up at once.
+    """
+
+    def __init__(self) -> None:
+        self.tiles: list[Mapping[str, object]] = []
+        self._ids: dict[int, int] = {}
+        self.walkable = np.zeros(0, dtype=bool)
+        self.graphics = np.zeros(0, dtype=TILE_GRAPHIC_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.tiles)
+
+    def intern(self, tile: Mapping[str, object]) -> int:
+        # ``self.tiles`` keeps every interned tile alive, so ``id`` stays unique.
+        tile_id = self._ids.get(id(tile))
+        if tile_id is None:
+            tile_id = len(self.tiles)
+            self.tiles.append(tile)
+            self._ids[id(tile)] = tile_id
+            self.walkable = np.append(self.walkable, bool(tile.get("walkable")))
+            glyph = str(tile.get("char") or " ")[:1]
+            graphic = np.array(
+                [(ord(glyph), tile.get("fg") or (255, 255, 255), tile.get("bg") or (0, 0, 0))],
+                dtype=TILE_GRAPHIC_DTYPE,
+            )
+            self.graphics = np.append(self.graphics, graphic)
+        return tile_id
+
+
+TILE_TABLE = TileTable()
+
+
+@dataclass(eq=False)
+class TileGrid:
+    """Terrain of one map stored as :data:`TILE_TABLE` ids.
+
+    ``walkable`` is derived from the table once so movement checks are a
+    single array lookup.
+    """
+
+    tile_ids: np.ndarray
+    width: int = field(init=False)
+    height: int = field(init=False)
+    walkable: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.height, self.width = self.tile_ids.shape
+        self.walkable = TILE_TABLE.walkable[self.tile_ids]
+
+    def walkable_indices(self) -> np.ndarray:
+        """Flat ``y * width + x`` indices of walkable cells.
+
+        Not cached: it is only needed while placing entities, and keeping one
+        per screen would cost more memory than the terrain itself.
+        """
+
+        return np.flatnonzero(self.walkable)
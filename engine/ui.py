@@ -1,78 +1,141 @@
 # engine/ui.py
 from __future__ import annotations
 
+from functools import lru_cache
 from textwrap import wrap
+import time
 
+import numpy as np
 import tcod
 from tcod.event import KeySym
 
+from engine.battle import build_battle_lines
+from engine.input import Action
 from engine.inventory import build_inventory_context
+from engine.tilemap import TILE_TABLE
 
 DEFAULT_TEXT_COLOR = (255, 255, 255)
 DEFAULT_WINDOW_BG = (0, 0, 0)
-
-
-def draw_text_window(
-    console,
-    lines,
-    padding: int = 1,
-    *,
-    fg_color: tuple[int, int, int] = DEFAULT_TEXT_COLOR,
-    bg_color: tuple[int, int, int] = DEFAULT_WINDOW_BG,
-) -> None:
-    """Отрисовать текстовое окно по центру консоли."""
-
-    if not lines:
-        return
-
-    max_content_width = max(1, console.width - 2 * padding - 2)
+MESSAGE_WINDOW_PADDING = 2
+
+_FRAME_FG = (200, 200, 200)
+_PANEL_BG = (20, 20, 20)
+_LABEL_FG = (180, 200, 255)
+_SLOT_BG_SELECTED = (90, 70, 120)
+_SLOT_BG_ACTIVE = (55, 55, 80)
+_SLOT_BG_TWO_HANDED = (70, 50, 90)
+_SLOT_BG_PASSIVE = (40, 40, 60)
+_ACTIVE_SLOT_FG = (230, 230, 230)
+_PASSIVE_SLOT_FG = (220, 220, 220)
+_CONTEXT_FG = (180, 180, 200)
+_CONTEXT_BG = (15, 15, 35)
+
+_SLOT_LABEL_CACHE: dict[str, str] = {}
+_context_panel: tuple[list, tuple[int, int], tcod.console.Console] | None = None
+
+_CLASS_MENU_KEYS = {
+    KeySym.N1: 0,
+    KeySym.KP_1: 0,
+    KeySym.N2: 1,
+    KeySym.KP_2: 1,
+}
+_KEYMAP = {
+    KeySym.W: Action.MOVE_UP,
+    KeySym.S: Action.MOVE_DOWN,
+    KeySym.A: Action.MOVE_LEFT,
+    KeySym.D: Action.MOVE_RIGHT,
+    KeySym.N1: Action.ATTACK,
+    KeySym.KP_1: Action.ATTACK,
+    KeySym.N2: Action.RUN_AWAY,
+    KeySym.KP_2: Action.RUN_AWAY,
+    KeySym.N3: Action.BRIBE,
+    KeySym.KP_3: Action.BRIBE,
+    KeySym.I: Action.INVENTORY,
+    KeySym.E: Action.TRANSFER,
+}
+
+
+@lru_cache(maxsize=64)
+def _layout_text_window(
+    lines: tuple[str, ...], console_width: int, padding: int
+) -> tuple[str, int, int]:
+    """Разбить строки окна по ширине и вычислить размеры рамки.
+
+    Строки возвращаются одним текстом через перевод строки, чтобы окно
+    печаталось одним вызовом ``console.print``.
+    """
+
+    max_content_width = max(1, console_width - 2 * padding - 2)
 
     processed_lines = []
     for line in lines:
         if line == "":
             processed_lines.append("")
             continue
+        # Короткая строка без служебных пробелов выходит из wrap() без изменений.
+        if (
+            len(line) <= max_content_width
+            and line.isprintable()
+            and not line.endswith(" ")
+        ):
+            processed_lines.append(line)
+            continue
         wrapped = wrap(line, max_content_width) or [""]
         processed_lines.extend(wrapped)
 
     inner_width = min(max(len(line) for line in processed_lines), max_content_width)
     frame_width = inner_width + 2 * padding + 2
     frame_height = len(processed_lines) + 2 * padding + 2
+    return "\n".join(processed_lines), frame_width, frame_height
 
-    start_x = max(0, (console.width - frame_width) // 2)
-    start_y = max(0, (console.height - frame_height) // 2)
 
-    console.draw_frame(
-        start_x,
-        start_y,
-        frame_width,
-        frame_height,
-        fg=fg_color,
-        bg=bg_color,
-        clear=False,
+@lru_cache(maxsize=16)
+def _message_window(lines: tuple[str, ...], console_width: int) -> tcod.console.Console:
+    """Заранее отрисовать окно сообщения с отступом и цветами по умолчанию."""
+
+    text, frame_width, frame_height = _layout_text_window(
+        lines, console_width, MESSAGE_WINDOW_PADDING
     )
+    window = tcod.console.Console(frame_width, frame_height)
+    window.draw_frame(
+        0, 0, frame_width, frame_height, fg=DEFAULT_TEXT_COLOR, bg=DEFAULT_WINDOW_BG
+    )
+    offset = MESSAGE_WINDOW_PADDING + 1
+    window.print(offset, offset, text, fg=DEFAULT_TEXT_COLOR, bg=DEFAULT_WINDOW_BG)
+    return window
 
-    if frame_width > 2 and frame_height > 2:
-        console.draw_rect(
-            start_x + 1,
-            start_y + 1,
-            frame_width - 2,
-            frame_height - 2,
-            ch=32,
-            fg=fg_color,
-            bg=bg_color,
-        )
 
-    text_x = start_x + padding + 1
-    text_y = start_y + padding + 1
+def draw_message_window(console, lines) -> None:
+    """Отрисовать окно меню или боя по центру консоли.
+
+    Готовое окно кэшируется по строкам и ширине консоли и только копируется
+    на консоль, пока текст не меняется.
+    """
+
+    if not lines:
+        return
+
+    window = _message_window(tuple(lines), console.width)
+    window.blit(
+        console,
+        max(0, (console.width - window.width) // 2),
+        max(0, (console.height - window.height) // 2),
+    )
+
+
+def _console_rgb_yx(console):
+    """Вернуть ``console.rgb`` с осями ``[y, x]`` независимо от ``order``."""
 
-    for i, line in enumerate(processed_lines):
-        console.print(text_x, text_y + i, line, fg=fg_color, bg=bg_color)
+    rgb = console.rgb
+    # Консоль с order="F" отдаёт транспонированный вид ``[x, y]``.
+    if rgb.strides[0] < rgb.strides[1]:
+        return rgb.T
+    return rgb
 
 
 def draw_map(
     console,
-    tiles,
+    tile_ids,
     player,
     player_position,
     *,
@@ -81,48 +144,57 @@ def draw_map(
     hide_enemies=False,
     footprints=None,
 ):
-    for y, row in enumerate(tiles):
-        for x, tile in enumerate(row):
-            console.print(x, y, tile["char"], fg=tile["fg"], bg=tile["bg"])
-
+    graphics = TILE_TABLE.graphics
+    rgb = _console_rgb_yx(console)
+    height = min(tile_ids.shape[0], console.height)
+    width = min(tile_ids.shape[1], console.width)
+    # Выборка пишется прямо в буфер консоли, без промежуточного массива.
+    np.take(graphics, tile_ids[:height, :width], out=rgb[:height, :width], mode="clip")
+
+    # Оверлеи собираются по порядку наложения и пишутся одной выборкой:
+    # при повторных координатах побеждает последняя запись.
+    cells: list[tuple[int, int, int, tuple, tuple]] = []
     if footprints:
-        for fx, fy, footprint_tile in footprints:
-            if 0 <= fy < console.height and 0 <= fx < console.width:
-                console.print(
-                    fx,
-                    fy,
-                    footprint_tile["char"],
-                    fg=footprint_tile["fg"],
-                    bg=footprint_tile["bg"],
-                )
+        cells.extend(
+            (fx, fy, ord(tile["char"]), tile["fg"], tile["bg"]) for fx, fy, tile in footprints
+        )
 
     if enemies and not hide_enemies:
-        for enemy, ex, ey in enemies:
-            if enemy and not getattr(enemy, "defeated", False):
-                console.print(ex, ey, enemy.char, fg=enemy.fg, bg=enemy.bg)
+        cells.extend(
+            (ex, ey, enemy.ch, enemy.fg, enemy.bg)
+            for enemy, ex, ey in enemies
+            if enemy and not enemy.defeated
+        )
 
     if characters:
-        for character, cx, cy in characters:
-            console.print(
-                cx,
-                cy,
-                character.char,
-                fg=character.fg,
-                bg=character.bg,
-            )
+        cells.extend(
+            (cx, cy, character.ch, character.fg, character.bg)
+            for character, cx, cy in characters
+        )
 
     px, py = player_position
-    if 0 <= py < len(tiles) and 0 <= px < len(tiles[py]):
-        player_tile_bg = tiles[py][px]["bg"]
+    if 0 <= py < tile_ids.shape[0] and 0 <= px < tile_ids.shape[1]:
+        player_tile_bg = graphics["bg"][tile_ids[py, px]]
     else:
         player_tile_bg = (0, 0, 0)
-    console.print(
-        px,
-        py,
-        player.tile["char"],
-        fg=player.tile["fg"],
-        bg=player_tile_bg,
-    )
+    cells.append((px, py, ord(player.tile["char"]), player.tile["fg"], player_tile_bg))
+
+    _write_cells(rgb, cells)
+
+
+def _write_cells(rgb, cells) -> None:
+    """Записать клетки ``(x, y, код символа, fg, bg)`` в массив консоли ``[y, x]``."""
+
+    xs, ys, codepoints, fgs, bgs = zip(*cells)
+    xs = np.array(xs)
+    ys = np.array(ys)
+    inside = (xs >= 0) & (xs < rgb.shape[1]) & (ys >= 0) & (ys < rgb.shape[0])
+    ys = ys[inside]
+    xs = xs[inside]
+    rgb["ch"][ys, xs] = np.array(codepoints, dtype=np.int32)[inside]
+    rgb["fg"][ys, xs] = np.array(fgs, dtype=np.uint8)[inside]
+    rgb["bg"][ys, xs] = np.array(bgs, dtype=np.uint8)[inside]
+
 
 def show_class_menu(console, context, classes):
     lines = ["Выбери класс:", ""]
@@ -132,42 +204,40 @@ def show_class_menu(console, context, classes):
         )
 
     console.clear()
-    draw_text_window(console, lines, padding=2)
+    draw_message_window(console, lines)
     context.present(console)
 
+    class_ids = list(classes)
     while True:
         for event in tcod.event.wait():
             if event.type == "KEYDOWN":
-                if event.sym in (KeySym.N1, KeySym.KP_1):
-                    return list(classes.keys())[0]
-                if event.sym in (KeySym.N2, KeySym.KP_2):
-                    return list(classes.keys())[1]
+                index = _CLASS_MENU_KEYS.get(event.sym)
+                if index is not None and index < len(class_ids):
+                    return class_ids[index]
 
 
 def draw_battle_ui(console, battle, talents_label: str):
-    bribe_cost = battle.bribe_cost()
-    turn_order = (
-        "игрок" if battle.player.average_power() >= battle.enemy.average_power() else "враг"
-    )
+    draw_message_window(console, build_battle_lines(battle, talents_label))
+
+
+def _slot_label(slot_char: str) -> str:
+    label = _SLOT_LABEL_CACHE.get(slot_char)
+    if label is None:
+        label = _SLOT_LABEL_CACHE[slot_char] = f"[{slot_char}]"
+    return label
+
+
+@lru_cache(maxsize=8)
+def _inventory_slot_cells(
+    active_count: int, columns: int, passive_rows: int, step: int
+) -> tuple[tuple[int, int], ...]:
+    """Смещения ячеек инвентаря от первой активной ячейки, по индексу слота."""
+
+    active = [(index * step, 0) for index in range(active_count)]
+    passive = [(col * step, 3 + row) for row in range(passive_rows) for col in range(columns)]
+    return tuple(active + passive)
+
 
-    lines = [
-        f"{battle.enemy.char}  {battle.enemy.name}",
-        f"HP врага: {battle.enemy.hp}/{battle.enemy.max_hp}",
-        "",
-        "Действия:",
-        "1) Атака  2) Побег  3) Откуп",
-        f"Стоимость откупа: {bribe_cost} талантов",
-        "",
-        f"Ваше здоровье: {battle.player.hp}/{battle.player.max_hp}",
-        f"Ходит первым: {turn_order}",
-        "",
-        "Журнал боя:",
-    ]
-
-    lines.extend(battle.log[-6:] or ["..."])
-    lines.extend(["", talents_label])
-
-    draw_text_window(console, lines, padding=2)
 def draw_inventory(console, player, talents_label: str) -> None:
     inventory = player.inventory
 
@@ -193,41 +263,48 @@ def draw_inventory(console, player, talents_label: str) -> None:
         start_y,
         frame_width,
         frame_height,
-        fg=(200, 200, 200),
-        bg=(20, 20, 20),
+        fg=_FRAME_FG,
+        bg=_PANEL_BG,
         clear=False,
     )
 
     text_x = start_x + padding + 1
     text_y = start_y + padding + 1
-    console.print(text_x, text_y, "Активные слоты:", fg=(180, 200, 255), bg=(20, 20, 20))
+    console.print(text_x, text_y, "Активные слоты:", fg=_LABEL_FG, bg=_PANEL_BG)
 
     slot_base_y = text_y + 1
-    for index, slot_name in enumerate(inventory.ACTIVE_SLOT_ORDER):
-        slot_char = inventory.active_slot_symbol(slot_name)
-        slot_x = text_x + index * (slot_width + horizontal_gap)
-        slot_index = index
-        is_selected = slot_index == inventory.cursor_index
-        is_two_handed = inventory.is_two_handed_slot(slot_name)
-        bg = (90, 70, 120) if is_selected else (55, 55, 80)
+    active_count = len(inventory.ACTIVE_SLOT_ORDER)
+    slot_cells = _inventory_slot_cells(
+        active_count, columns, inventory.passive_rows, slot_width + horizontal_gap
+    )
+    cursor_index = inventory.cursor_index
+    for index, (_, slot_char, is_two_handed) in enumerate(inventory.active_slot_view()):
+        offset_x, offset_y = slot_cells[index]
+        is_selected = index == cursor_index
+        bg = _SLOT_BG_SELECTED if is_selected else _SLOT_BG_ACTIVE
         if is_two_handed and not is_selected:
-            bg = (70, 50, 90)
-        console.print(slot_x, slot_base_y, f"[{slot_char}]", fg=(230, 230, 230), bg=bg)
+            bg = _SLOT_BG_TWO_HANDED
+        console.print(
+            text_x + offset_x,
+            slot_base_y + offset_y,
+            _slot_label(slot_char),
+            fg=_ACTIVE_SLOT_FG,
+            bg=bg,
+        )
 
     passive_label_y = slot_base_y + 2
-    console.print(text_x, passive_label_y, "Пассивные слоты:", fg=(180, 200, 255), bg=(20, 20, 20))
-
-    grid_start_y = passive_label_y + 1
-    for row in range(inventory.passive_rows):
-        for col in range(columns):
-            slot_index = len(inventory.ACTIVE_SLOT_ORDER) + row * columns + col
-            passive_index = slot_index - len(inventory.ACTIVE_SLOT_ORDER)
-            slot_char = inventory.passive_slot_symbol(passive_index)
-            slot_x = text_x + col * (slot_width + horizontal_gap)
-            slot_y = grid_start_y + row
-            is_selected = slot_index == inventory.cursor_index
-            bg = (90, 70, 120) if is_selected else (40, 40, 60)
-            console.print(slot_x, slot_y, f"[{slot_char}]", fg=(220, 220, 220), bg=bg)
+    console.print(text_x, passive_label_y, "Пассивные слоты:", fg=_LABEL_FG, bg=_PANEL_BG)
+
+    for slot_index, slot_char in enumerate(inventory.passive_slot_view(), start=active_count):
+        offset_x, offset_y = slot_cells[slot_index]
+        bg = _SLOT_BG_SELECTED if slot_index == cursor_index else _SLOT_BG_PASSIVE
+        console.print(
+            text_x + offset_x,
+            slot_base_y + offset_y,
+            _slot_label(slot_char),
+            fg=_PASSIVE_SLOT_FG,
+            bg=bg,
+        )
 
     _draw_inventory_context(console, context_lines, panel_height)
 
@@ -235,17 +312,105 @@ def draw_inventory(console, player, talents_label: str) -> None:
 def _draw_inventory_context(
     console, context_lines: list[tuple[str, tuple[int, int, int]]], panel_height: int
 ) -> None:
-    start_y = console.height - panel_height
-    console.draw_rect(
-        0,
-        start_y,
-        console.width,
-        panel_height,
-        ch=32,
-        fg=(180, 180, 200),
-        bg=(15, 15, 35),
-    )
+    """Нарисовать нижнюю панель инвентаря.
+
+    Панель собирается во внеэкранной консоли и переиспользуется, пока
+    ``build_inventory_context`` возвращает тот же список строк.
+    """
+
+    global _context_panel
+
+    size = (console.width, panel_height)
+    cached = _context_panel
+    if cached is not None and cached[0] is context_lines and cached[1] == size:
+        panel = cached[2]
+    else:
+        panel = tcod.console.Console(console.width, panel_height)
+        panel.draw_rect(
+            0,
+            0,
+            console.width,
+            panel_height,
+            ch=32,
+            fg=_CONTEXT_FG,
+            bg=_CONTEXT_BG,
+        )
+        max_lines = panel_height - 1
+        for offset, (text, color) in enumerate(context_lines[:max_lines]):
+            panel.print(2, offset + 1, text, fg=color, bg=_CONTEXT_BG)
+        _context_panel = (context_lines, size, panel)
+
+    panel.blit(console, 0, console.height - panel_height)
+
+
+class TcodRenderer:
+    """Консольный рендерер с тем же интерфейсом, что и ``PygameRenderer``."""
+
+    def __init__(self, context, width: int, height: int) -> None:
+        self.context = context
+        self.console = tcod.console.Console(width, height, order="F")
+        self._last_time = time.perf_counter()
+
+    def clear(self) -> None:
+        self.console.clear()
+
+    def present(self) -> None:
+        self.context.present(self.console)
+
+    def tick(self) -> float:
+        """Вернуть время с прошлого кадра в секундах; темп задаёт vsync."""
+
+        now = time.perf_counter()
+        delta = now - self._last_time
+        self._last_time = now
+        return delta
+
+    def poll_actions(self, wait: bool = True):
+        """Выдать действия нажатых клавиш; выход и Escape завершают игру.
+
+        ``wait`` не используется: цикл tcod не блокируется, темп задаёт vsync.
+        """
+
+        for raw_event in tcod.event.get():
+            event = self.context.convert_event(raw_event)
+            if event.type == "QUIT":
+                raise SystemExit()
+            if event.type != "KEYDOWN":
+                continue
+            if event.sym == KeySym.ESCAPE:
+                raise SystemExit()
+            action = _KEYMAP.get(event.sym)
+            if action is not None:
+                yield action
+
+    def show_class_menu(self, classes) -> str:
+        return show_class_menu(self.console, self.context, classes)
+
+    def draw_map(
+        self,
+        tile_ids,
+        player,
+        player_position,
+        *,
+        enemies=None,
+        characters=None,
+        hide_enemies: bool = False,
+        footprints=None,
+        camera=None,
+    ) -> None:
+        draw_map(
+            self.console,
+            tile_ids,
+            player,
+            player_position,
+            enemies=enemies,
+            characters=characters,
+            hide_enemies=hide_enemies,
+            footprints=footprints,
+        )
+
+    def draw_battle_ui(self, battle, talents_label: str) -> None:
+        draw_battle_ui(self.console, battle, talents_label)
 
-    max_lines = panel_height - 1
-    for offset, (text, color) in enumerate(context_lines[:max_lines]):
-        console.print(2, start_y + offset + 1, text, fg=color, bg=(15, 15, 35))
+    def draw_inventory(self, player, talents_label: str) -> None:
+        draw_inventory(self.console, player, talents_label)
@@ -2,8 +2,12 @@
 from __future__ import annotations
 
 import random
-from dataclasses import dataclass
-from typing import Dict, Iterable, Iterator, Mapping, TYPE_CHECKING
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Iterator, Mapping, TYPE_CHECKING
+
+import numpy as np
 
 from data.characters import CHARACTERS
 from data.enemies import ENEMIES
@@ -20,19 +24,33 @@ from engine.constants import (
     WORLD_ROWS,
 )
 from engine.mapgen import generate_map
+from engine.tilemap import TILE_ID_DTYPE, TileGrid
 
 if TYPE_CHECKING:  # pragma: no cover - runtime import cycle guard
     from engine.player import Player
 
 
+_RNG = np.random.default_rng()
+# Scalar draws for entity placement; ``random.Random`` beats a numpy
+# Generator at one number per call.
+_PLACEMENT_RNG = random.Random()
+
+
 @dataclass
 class WorldScreen:
     tiles: dict
-    terrain: list[list[dict]]
+    terrain: TileGrid
     biome: str
     biome_weights: Mapping[str, float]
     enemies: list[Enemy]
     characters: list[Character]
+    # Fixed for the screen's lifetime, so resolved once instead of per frame.
+    footprint_tile: Mapping[str, object] | None = field(init=False, repr=False)
+    is_winter: bool = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.footprint_tile = self.tiles.get("footprint")
+        self.is_winter = self.biome == "winter"
 
 
 @dataclass
@@ -41,6 +59,9 @@ class World:
     spawn_screen: tuple[int, int]
     spawn_position: tuple[int, int]
     time_elapsed: float = 0.0
+    _viewport_ids: np.ndarray | None = field(default=None, init=False, repr=False)
+    _viewport: ViewportData | None = field(default=None, init=False, repr=False)
+    _viewport_key: tuple | None = field(default=None, init=False, repr=False)
 
     def total_width(self) -> int:
         return MAP_WIDTH * WORLD_COLUMNS
@@ -51,7 +72,7 @@ class World:
     def get_screen(self, coords: tuple[int, int]) -> WorldScreen:
         return self.screens[coords]
 
-    def map_at(self, coords: tuple[int, int]) -> list[list[dict]]:
+    def map_at(self, coords: tuple[int, int]) -> TileGrid:
         return self.get_screen(coords).terrain
 
     def tiles_at(self, coords: tuple[int, int]) -> dict:
@@ -71,10 +92,24 @@ class World:
             return
         self.time_elapsed += delta
 
+    def invalidate_viewport(self) -> None:
+        """Make the next ``build_viewport`` call rebuild the view.
+
+        Needed after changes the player's position does not reflect, such as
+        an enemy leaving a screen or footprints left by several moves that end
+        on the same cell.
+        """
+
+        self._viewport = None
+
     def _clamp_camera(self, x: int, y: int, width: int, height: int) -> tuple[int, int]:
-        max_x = max(0, self.total_width() - width)
-        max_y = max(0, self.total_height() - height)
-        return max(0, min(x, max_x)), max(0, min(y, max_y))
+        # Clamp to the far edge first so a view wider than the world ends up
+        # at 0.
+        max_x = self.total_width() - width
+        max_y = self.total_height() - height
+        x = x if x < max_x else max_x
+        y = y if y < max_y else max_y
+        return (x if x > 0 else 0), (y if y > 0 else 0)
 
     def _screens_in_rect(
         self, start_x: int, start_y: int, width: int, height: int
@@ -102,26 +137,22 @@ class World:
         width: int = SCREEN_WIDTH,
         height: int = SCREEN_HEIGHT,
     ) -> "ViewportData":
+        # Idle frames reuse the previous view until the player moves or the
+        # view is invalidated.
+        key = (player, player.screen_x, player.screen_y, player.x, player.y, width, height)
+        if self._viewport is not None and self._viewport_key == key:
+            return self._viewport
+
         world_x = player.screen_x * MAP_WIDTH + player.x
         world_y = player.screen_y * MAP_HEIGHT + player.y
         camera_x = world_x - width // 2
         camera_y = world_y - height // 2
         camera_x, camera_y = self._clamp_camera(camera_x, camera_y, width, height)
 
-        tiles: list[list[dict]] = []
-        for local_y in range(height):
-            row: list[dict] = []
-            world_y_coord = camera_y + local_y
-            screen_y = world_y_coord // MAP_HEIGHT
-            tile_y = world_y_coord % MAP_HEIGHT
-            for local_x in range(width):
-                world_x_coord = camera_x + local_x
-                screen_x = world_x_coord // MAP_WIDTH
-                tile_x = world_x_coord % MAP_WIDTH
-                screen = self.screens[(screen_x, screen_y)]
-                row.append(screen.terrain[tile_y][tile_x])
-            tiles.append(row)
-
+        # The id buffer is reused between frames; every cell is overwritten below.
+        tile_ids = self._viewport_ids
+        if tile_ids is None or tile_ids.shape != (height, width):
+            tile_ids = self._viewport_ids = np.empty((height, width), dtype=TILE_ID_DTYPE)
         footprints: list[tuple[int, int, dict]] = []
         enemies: list[tuple[Enemy, int, int]] = []
         characters: list[tuple[Character, int, int]] = []
@@ -131,47 +162,62 @@ class World:
             base_x = screen_coords[0] * MAP_WIDTH
             base_y = screen_coords[1] * MAP_HEIGHT
 
-            footprint_tile = screen.tiles.get("footprint")
+            # The part of this screen under the camera, in screen-local cells.
+            left = max(camera_x, base_x) - base_x
+            right = min(camera_x + width, base_x + MAP_WIDTH) - base_x
+            top = max(camera_y, base_y) - base_y
+            bottom = min(camera_y + height, base_y + MAP_HEIGHT) - base_y
+            offset_x = base_x - camera_x
+            offset_y = base_y - camera_y
+            tile_ids[top + offset_y : bottom + offset_y, left + offset_x : right + offset_x] = (
+                screen.terrain.tile_ids[top:bottom, left:right]
+            )
+
+            # Entities are culled against that local rectangle, so each test is
+            # two chained comparisons on the stored coordinates.
+            footprint_tile = screen.footprint_tile
             if footprint_tile:
                 for fx, fy in player.get_footprints(screen_coords):
-                    world_fx = base_x + fx
-                    world_fy = base_y + fy
-                    if camera_x <= world_fx < camera_x + width and camera_y <= world_fy < camera_y + height:
-                        footprints.append(
-                            (world_fx - camera_x, world_fy - camera_y, footprint_tile)
-                        )
+                    if left <= fx < right and top <= fy < bottom:
+                        footprints.append((fx + offset_x, fy + offset_y, footprint_tile))
 
             for enemy in screen.enemies:
-                if enemy and not getattr(enemy, "defeated", False):
-                    world_ex = base_x + enemy.x
-                    world_ey = base_y + enemy.y
-                    if camera_x <= world_ex < camera_x + width and camera_y <= world_ey < camera_y + height:
-                        enemies.append((enemy, world_ex - camera_x, world_ey - camera_y))
+                if not enemy.defeated:
+                    ex = enemy.x
+                    ey = enemy.y
+                    if left <= ex < right and top <= ey < bottom:
+                        enemies.append((enemy, ex + offset_x, ey + offset_y))
 
             for character in screen.characters:
-                world_cx = base_x + character.x
-                world_cy = base_y + character.y
-                if camera_x <= world_cx < camera_x + width and camera_y <= world_cy < camera_y + height:
-                    characters.append(
-                        (character, world_cx - camera_x, world_cy - camera_y)
-                    )
+                cx = character.x
+                cy = character.y
+                if left <= cx < right and top <= cy < bottom:
+                    characters.append((character, cx + offset_x, cy + offset_y))
 
         player_view_x = world_x - camera_x
         player_view_y = world_y - camera_y
 
-        return ViewportData(
-            tiles=tiles,
+        self._viewport = ViewportData(
+            tile_ids=tile_ids,
             player_position=(player_view_x, player_view_y),
             camera=(camera_x, camera_y),
             enemies=enemies,
             characters=characters,
             footprints=footprints,
         )
+        self._viewport_key = key
+        return self._viewport
 
 
 @dataclass
 class ViewportData:
-    tiles: list[list[dict]]
+    """One frame's view of the world.
+
+    ``tile_ids`` is a buffer owned by the :class:`World`; the next rebuilt
+    viewport overwrites it. Unchanged frames get the same instance back.
+    """
+
+    tile_ids: np.ndarray
     player_position: tuple[int, int]
     camera: tuple[int, int]
     enemies: list[tuple[Enemy, int, int]]
@@ -216,42 +262,56 @@ def _biome_weights_for_height(normalized_y: float) -> Dict[str, float]:
     }
 
 
-def find_spawn(game_map: Iterable[Iterable[dict]]) -> tuple[int, int]:
+@lru_cache(maxsize=None)
+def _biome_weights_for_row(tile_y: int, total_tiles: int) -> Mapping[str, float]:
+    """Read-only biome weights for a world tile row, memoised by row index."""
+
+    return MappingProxyType(_biome_weights_for_height(_normalized_height(tile_y, total_tiles)))
+
+
+def find_spawn(game_map: TileGrid) -> tuple[int, int]:
     """Find a walkable tile near the centre of the map."""
 
+    walkable = game_map.walkable
     cx, cy = MAP_WIDTH // 2, MAP_HEIGHT // 2
-    if game_map[cy][cx]["walkable"]:
+    if walkable[cy, cx]:
         return cx, cy
 
-    for r in range(1, max(MAP_WIDTH, MAP_HEIGHT)):
-        for y in range(max(0, cy - r), min(MAP_HEIGHT, cy + r + 1)):
-            for x in range(max(0, cx - r), min(MAP_WIDTH, cx + r + 1)):
-                if game_map[y][x]["walkable"]:
-                    return x, y
-    return 0, 0
+    # Nearest by Chebyshev distance; ``nonzero`` is row-major, so ``argmin``
+    # keeps the top-left cell of the closest ring.
+    ys, xs = np.nonzero(walkable)
+    if ys.size == 0:
+        return 0, 0
+    index = int(np.argmin(np.maximum(np.abs(xs - cx), np.abs(ys - cy))))
+    return int(xs[index]), int(ys[index])
 
 
 def find_random_walkable(
-    game_map, exclude: Iterable[tuple[int, int]] | None = None
+    game_map: TileGrid, exclude: Iterable[tuple[int, int]] | None = None
 ) -> tuple[int, int]:
-    width = len(game_map[0])
-    height = len(game_map)
-    exclude_set = set(exclude or [])
-    attempts = 0
-    while attempts < 500:
-        x = random.randint(0, width - 1)
-        y = random.randint(0, height - 1)
-        if (x, y) in exclude_set:
-            attempts += 1
-            continue
-        if game_map[y][x]["walkable"]:
+    candidates = game_map.walkable_indices()
+    if candidates.size == 0:
+        return 0, 0
+    width = game_map.width
+    # Compare flat ``y * width + x`` indices so no tuple is built per draw.
+    excluded = {y * width + x for x, y in exclude or ()}
+    # Exclusions are a handful of cells, so a few draws almost always succeed.
+    for _ in range(8):
+        index = int(candidates[_PLACEMENT_RNG.randrange(candidates.size)])
+        if index not in excluded:
+            y, x = divmod(index, width)
             return x, y
-        attempts += 1
-    return 0, 0
 
+    remaining = candidates[~np.isin(candidates, list(excluded))]
+    if remaining.size == 0:
+        return 0, 0
+    y, x = divmod(int(remaining[_PLACEMENT_RNG.randrange(remaining.size)]), width)
+    return x, y
 
-def _enemy_id_for_biome(biome: str) -> str:
-    """Select an enemy identifier based on biome spawn weights."""
+
+@lru_cache(maxsize=None)
+def _enemy_table_for_biome(biome: str) -> tuple[tuple[str, ...], np.ndarray]:
+    """Return enemy identifiers spawning in ``biome`` and their probabilities."""
 
     weighted: list[tuple[str, float]] = []
     for enemy_id, data in ENEMIES.items():
@@ -270,105 +330,122 @@ def _enemy_id_for_biome(biome: str) -> str:
 
     if not weighted:
         # Fall back to the first defined enemy to avoid empty maps.
-        return next(iter(ENEMIES))
+        return (next(iter(ENEMIES)),), np.ones(1)
+
+    weights = np.array([weight for _, weight in weighted])
+    return tuple(enemy_id for enemy_id, _ in weighted), weights / weights.sum()
 
-    total = sum(weight for _, weight in weighted)
-    roll = random.random() * total
-    cumulative = 0.0
-    for enemy_id, weight in weighted:
-        cumulative += weight
-        if roll <= cumulative:
-            return enemy_id
-    return weighted[-1][0]
+
+def _enemy_ids_for_biome(biome: str, count: int) -> list[str]:
+    """Select ``count`` enemy identifiers based on biome spawn weights."""
+
+    enemy_ids, probabilities = _enemy_table_for_biome(biome)
+    picks = _RNG.choice(len(enemy_ids), size=count, p=probabilities)
+    return [enemy_ids[index] for index in picks.tolist()]
+
+
+@lru_cache(maxsize=None)
+def _enemy_factory(enemy_id: str) -> Callable[..., Enemy]:
+    """Return an :class:`Enemy` constructor with ``enemy_id``'s data bound."""
+
+    data = ENEMIES[enemy_id]
+    return partial(
+        Enemy,
+        name=data["name"],
+        char=data["char"],
+        fg=data["fg"],
+        bg=data["bg"],
+        max_hp=data["hp"],
+        attack_min=data["attack_min"],
+        attack_max=data["attack_max"],
+        reward_talents=data["reward_talents"],
+        stats=data["stats"],
+        tile_key=data.get("tile"),
+    )
 
 
 def build_world() -> World:
     biome_cache: Dict[str, BiomeDefinition] = {}
+    combined_cache: Dict[tuple[str, ...], dict[str, dict]] = {}
     screens: Dict[tuple[int, int], WorldScreen] = {}
     total_tiles = WORLD_ROWS * MAP_HEIGHT
 
     for sy in range(WORLD_ROWS):
-        for sx in range(WORLD_COLUMNS):
-            centre_tile_y = sy * MAP_HEIGHT + MAP_HEIGHT // 2
-            centre_normalized = _normalized_height(centre_tile_y, total_tiles)
-            biome_weights = _biome_weights_for_height(centre_normalized)
-            biome = max(biome_weights, key=biome_weights.get)
-
-            relevant_biomes = [name for name, weight in biome_weights.items() if weight > 0.01]
-            if not relevant_biomes:
-                relevant_biomes = [biome]
-            biome_definitions: Dict[str, BiomeDefinition] = {}
-            for name in relevant_biomes:
-                biome_definitions[name] = biome_cache.setdefault(
-                    name, get_biome_definition(name)
-                )
+        # Biome weights depend only on the row of screens, so the choices and
+        # per-row cumulative bounds are shared by every screen in the row.
+        centre_tile_y = sy * MAP_HEIGHT + MAP_HEIGHT // 2
+        biome_weights = _biome_weights_for_row(centre_tile_y, total_tiles)
+        biome = max(biome_weights, key=biome_weights.get)
+
+        relevant_biomes = [name for name, weight in biome_weights.items() if weight > 0.01]
+        if not relevant_biomes:
+            relevant_biomes = [biome]
+        biome_definitions: Dict[str, BiomeDefinition] = {}
+        for name in relevant_biomes:
+            biome_definitions[name] = biome_cache.setdefault(
+                name, get_biome_definition(name)
+            )
+        option_index = {name: index for index, name in enumerate(biome_definitions)}
+
+        # Screens only read their tile palette, so every screen with the same
+        # biome set shares one merged dict. The key keeps the merge order.
+        biome_set = tuple(biome_definitions)
+        combined_tiles = combined_cache.get(biome_set)
+        if combined_tiles is None:
+            combined_tiles = combined_cache[biome_set] = {}
+            for definition in biome_definitions.values():
+                combined_tiles.update(definition.tiles)
+
+        row_weights = np.zeros((MAP_HEIGHT, len(option_index)))
+        for ty in range(MAP_HEIGHT):
+            global_y = sy * MAP_HEIGHT + ty
+            tile_weights = _biome_weights_for_row(global_y, total_tiles)
+            weighted_choices = [
+                (name, tile_weights.get(name, 0.0))
+                for name in relevant_biomes
+                if tile_weights.get(name, 0.0) > 0.0
+            ]
+            if not weighted_choices or sum(weight for _, weight in weighted_choices) <= 0:
+                weighted_choices = [(biome, 1.0)]
+            for name, weight in weighted_choices:
+                row_weights[ty, option_index[name]] = weight
+        cumulative = np.cumsum(row_weights, axis=1)
+        row_enemy_ids = _enemy_ids_for_biome(biome, WORLD_COLUMNS)
 
-            terrain_options: Dict[str, list[list[dict]]] = {}
+        for sx in range(WORLD_COLUMNS):
+            terrain_options: Dict[str, TileGrid] = {}
             for name, definition in biome_definitions.items():
                 terrain_options[name] = generate_map(MAP_WIDTH, MAP_HEIGHT, definition)
 
-            combined_tiles: dict[str, dict] = {}
-            for definition in biome_definitions.values():
-                combined_tiles.update(definition.tiles)
+            if len(terrain_options) == 1:
+                # A single relevant biome wins every roll; use its map as is.
+                terrain = next(iter(terrain_options.values()))
+            else:
+                option_layers = np.stack(
+                    [grid.tile_ids for grid in terrain_options.values()]
+                )
 
-            terrain: list[list[dict]] = []
-            for ty in range(MAP_HEIGHT):
-                row: list[dict] = []
-                global_y = sy * MAP_HEIGHT + ty
-                normalized = _normalized_height(global_y, total_tiles)
-                tile_weights = _biome_weights_for_height(normalized)
-                weighted_choices = [
-                    (name, tile_weights.get(name, 0.0))
-                    for name in relevant_biomes
-                    if tile_weights.get(name, 0.0) > 0.0
-                ]
-                if not weighted_choices:
-                    weighted_choices = [(biome, 1.0)]
-
-                cumulative_max = sum(weight for _, weight in weighted_choices)
-                if cumulative_max <= 0:
-                    weighted_choices = [(biome, 1.0)]
-                    cumulative_max = 1.0
-
-                for tx in range(MAP_WIDTH):
-                    roll = random.random() * cumulative_max
-                    cumulative = 0.0
-                    chosen_biome = weighted_choices[-1][0]
-                    for candidate, weight in weighted_choices:
-                        cumulative += weight
-                        if roll <= cumulative:
-                            chosen_biome = candidate
-                            break
-                    tile = terrain_options[chosen_biome][ty][tx].copy()
-                    row.append(tile)
-                terrain.append(row)
+                # Each cell rolls against its row's cumulative weights; the
+                # option index is the number of cumulative bounds the roll
+                # exceeds.
+                rolls = _RNG.random((MAP_HEIGHT, MAP_WIDTH)) * cumulative[:, -1:]
+                chosen_options = np.minimum(
+                    (rolls[:, :, np.newaxis] > cumulative[:, np.newaxis, :]).sum(axis=2),
+                    len(option_index) - 1,
+                )
+                blended_ids = np.take_along_axis(
+                    option_layers, chosen_options[np.newaxis], axis=0
+                )[0]
+                terrain = TileGrid(blended_ids)
 
             coords = (sx, sy)
-            enemy_id = _enemy_id_for_biome(biome)
-            enemy_data = ENEMIES[enemy_id]
             enemies = []
             characters: list[Character] = []
 
             ex, ey = find_random_walkable(terrain)
-            if terrain[ey][ex]["walkable"]:
-                enemies.append(
-                    Enemy(
-                        name=enemy_data["name"],
-                        char=enemy_data["char"],
-                        fg=enemy_data["fg"],
-                        bg=enemy_data["bg"],
-                        max_hp=enemy_data["hp"],
-                        attack_min=enemy_data["attack_min"],
-                        attack_max=enemy_data["attack_max"],
-                        reward_talents=enemy_data["reward_talents"],
-                        stats=enemy_data["stats"],
-                        x=ex,
-                        y=ey,
-                        screen_x=sx,
-                        screen_y=sy,
-                        tile_key=enemy_data.get("tile"),
-                    )
-                )
+            if terrain.walkable[ey, ex]:
+                make_enemy = _enemy_factory(row_enemy_ids[sx])
+                enemies.append(make_enemy(x=ex, y=ey, screen_x=sx, screen_y=sy))
 
             screens[coords] = WorldScreen(
                 tiles=combined_tiles,
@@ -381,7 +458,7 @@ def build_world() -> World:
 
     warlock_data = CHARACTERS["warlock"]
     available_screens = list(screens.keys())
-    random.shuffle(available_screens)
+    _PLACEMENT_RNG.shuffle(available_screens)
     warlock_spawns = available_screens[: min(5, len(available_screens))]
 
     for screen_coords in warlock_spawns:
@@ -389,7 +466,7 @@ def build_world() -> World:
         occupied = [(enemy.x, enemy.y) for enemy in screen.enemies]
         occupied.extend((character.x, character.y) for character in screen.characters)
         wx, wy = find_random_walkable(screen.terrain, exclude=occupied)
-        if not screen.terrain[wy][wx]["walkable"]:
+        if not screen.terrain.walkable[wy, wx]:
             continue
         screen.characters.append(
             Character(
@@ -416,7 +493,7 @@ def build_world() -> World:
             new_x, new_y = find_random_walkable(
                 spawn_map, exclude=[spawn_position]
             )
-            if spawn_map[new_y][new_x]["walkable"]:
+            if spawn_map.walkable[new_y, new_x]:
                 enemy.x = new_x
                 enemy.y = new_y
             else: